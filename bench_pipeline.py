@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Banc de mesure du pipeline d'extraction (PDF synthétiques générés localement)
+
+Génère avec PyMuPDF des PDF de 1, 50 et 500 pages en trois variantes
+(texte seul, scans, mélange), chronomètre chaque étape (ouverture, rendu,
+encodage, écriture, pipeline complet, JSON) ainsi que create_receipt.py,
+et écrit les résultats en JSON pour les comparer à une référence.
+"""
+import fitz  # PyMuPDF
+import argparse
+import io
+import json
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from multiprocessing import get_context
+from pathlib import Path
+
+RESULTS_VERSION = 1
+DEFAULT_SIZES = (1, 50, 500)
+DEFAULT_KINDS = ("text", "scan", "mixed")
+DEFAULT_RECEIPTS = 50
+DEFAULT_TOLERANCE = 0.2
+
+# Page A4 et scan simulé à 150 dpi (papier légèrement bruité, lignes sombres)
+PAGE_SIZE = (595, 842)
+SCAN_SIZE = (1240, 1754)
+SCAN_LINE_PITCH = 24
+SCAN_LINE_HEIGHT = 10
+
+# Métriques comparées à la référence (plus grand = plus lent)
+COMPARED_METRICS = ("open", "render", "encode", "write", "pipeline", "json")
+
+def _scan_jpeg(seed):
+    """Image JPEG en niveaux de gris imitant une page scannée"""
+    rng = random.Random(seed)
+    width, height = SCAN_SIZE
+    paper = bytes(228 + value % 20 for value in range(256))
+    ink = bytes(40 + value % 30 for value in range(256))
+    rows = []
+    for y in range(height):
+        row = rng.randbytes(width).translate(paper)
+        if y > 150 and y % SCAN_LINE_PITCH < SCAN_LINE_HEIGHT:
+            start = 120 + rng.randrange(40)
+            end = width - 120 - rng.randrange(width // 2)
+            row = row[:start] + row[start:end].translate(ink) + row[end:]
+        rows.append(row)
+    pix = fitz.Pixmap(fitz.csGRAY, width, height, b"".join(rows), False)
+    return pix.tobytes("jpg")
+
+def _insert_text_page(page, page_number, rng):
+    """Remplit la page de lignes de texte portant des montants au format français"""
+    page.insert_text((60, 70), f"Relevé n° {page_number}", fontsize=16)
+    for line in range(36):
+        amount = f"{rng.randrange(1, 2000)},{rng.randrange(100):02d} €"
+        page.insert_text((60, 110 + line * 19), f"Opération {line + 1:02d} — libellé de test", fontsize=10)
+        page.insert_text((430, 110 + line * 19), amount, fontsize=10)
+    page.draw_rect(fitz.Rect(50, 95, 545, 800), color=(0.2, 0.2, 0.2), width=0.8)
+
+def make_pdf(path, pages, kind, seed=0):
+    """Écrit un PDF synthétique de `pages` pages (text, scan ou mixed)"""
+    rng = random.Random(seed)
+    scan_xref = 0
+    with fitz.open() as doc:
+        for page_number in range(1, pages + 1):
+            page = doc.new_page(width=PAGE_SIZE[0], height=PAGE_SIZE[1])
+            is_scan = kind == "scan" or (kind == "mixed" and page_number % 2 == 0)
+            if is_scan:
+                # Un seul flux image partagé : le PDF reste petit même à 500 pages
+                if scan_xref:
+                    page.insert_image(page.rect, xref=scan_xref)
+                else:
+                    scan_xref = page.insert_image(page.rect, stream=_scan_jpeg(seed))
+                if kind == "mixed":
+                    page.insert_text((60, 60), f"Annoté {page_number}", fontsize=12, color=(0.8, 0, 0))
+            else:
+                _insert_text_page(page, page_number, rng)
+        doc.save(path, garbage=3, deflate=True)
+    return path
+
+def _peak_rss():
+    """Pic de mémoire résidente du processus courant, en octets"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux compte en kio, macOS en octets
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def _tree_bytes(path):
+    """Taille totale des fichiers sous path"""
+    return sum(file.stat().st_size for file in Path(path).rglob("*") if file.is_file())
+
+def bench_pdf(pdf_path, work_dir):
+    """Chronomètre les étapes sur un PDF (à exécuter dans un processus neuf)"""
+    import extraction
+
+    work_dir = Path(work_dir)
+    stages = dict.fromkeys(("open", "render", "encode", "write", "pipeline", "json"), 0.0)
+    matrix = fitz.Matrix(extraction.RENDER_ZOOM, extraction.RENDER_ZOOM)
+
+    # Étapes isolées : une pixmap à la fois, comme le pipeline
+    raw_dir = work_dir / "raw"
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    doc = fitz.open(pdf_path)
+    stages["open"] = time.perf_counter() - started
+    with doc:
+        pages = len(doc)
+        for page in doc:
+            started = time.perf_counter()
+            pix = page.get_pixmap(matrix=matrix)
+            rendered = time.perf_counter()
+            data = pix.tobytes(extraction.IMAGE_FORMAT)
+            encoded = time.perf_counter()
+            (raw_dir / f"page_{page.number + 1}.{extraction.IMAGE_FORMAT}").write_bytes(data)
+            stages["render"] += rendered - started
+            stages["encode"] += encoded - rendered
+            stages["write"] += time.perf_counter() - encoded
+            pix = None
+
+    # Pipeline complet (sans cache, réglages par défaut) puis écriture des JSON
+    output_dir = work_dir / "assets"
+    spec = extraction.load_spec()
+    with redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        images = list(extraction.iter_pages(pdf_path, output_dir, use_cache=False, cache_root=work_dir / "cache"))
+        stages["pipeline"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        extraction.create_documents_json(output_dir, images, spec)
+        extraction.create_budget_json(output_dir, spec)
+        extraction.create_quiz_json(output_dir, spec)
+        stages["json"] = time.perf_counter() - started
+
+    return {
+        "pages": pages,
+        "stages": stages,
+        "pagesPerSecond": pages / stages["pipeline"] if stages["pipeline"] else None,
+        "peakRss": _peak_rss(),
+        "outputBytes": _tree_bytes(output_dir)
+    }
+
+def bench_receipts(count, work_dir):
+    """Chronomètre create_receipt.py sur `count` quittances (processus neuf)"""
+    import create_receipt
+
+    receipts = [
+        dict(create_receipt.DEFAULT_RECEIPT, montant=500 + index) for index in range(count)
+    ]
+    started = time.perf_counter()
+    _, written = create_receipt.render_receipts(receipts, Path(work_dir) / "receipts", with_svg=True)
+    elapsed = time.perf_counter() - started
+    return {
+        "receipts": count,
+        "stages": {"render": elapsed},
+        "receiptsPerSecond": count / elapsed if elapsed else None,
+        "peakRss": _peak_rss(),
+        "outputBytes": written
+    }
+
+def _isolated(function, *args):
+    """Exécute une mesure dans un processus neuf (pic mémoire propre à la mesure)"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+        return executor.submit(function, *args).result()
+
+def run_benchmarks(work_dir, sizes=DEFAULT_SIZES, kinds=DEFAULT_KINDS, receipts=DEFAULT_RECEIPTS):
+    """Génère les PDF, mesure chaque cas et retourne le document de résultats"""
+    work_dir = Path(work_dir)
+    cases = {}
+    for kind in kinds:
+        for size in sizes:
+            name = f"{kind}-{size}"
+            pdf_path = make_pdf(work_dir / f"{name}.pdf", size, kind)
+            result = _isolated(bench_pdf, str(pdf_path), str(work_dir / name))
+            result["pdfBytes"] = pdf_path.stat().st_size
+            cases[name] = result
+            print(f"✓ {name}: {result['pagesPerSecond']:.1f} pages/s, "
+                  f"{result['peakRss'] / 1e6:.0f} Mo RSS, {result['outputBytes']} octets", flush=True)
+
+    if receipts:
+        name = f"receipts-{receipts}"
+        cases[name] = result = _isolated(bench_receipts, receipts, str(work_dir / name))
+        print(f"✓ {name}: {result['receiptsPerSecond']:.1f} quittances/s, "
+              f"{result['peakRss'] / 1e6:.0f} Mo RSS, {result['outputBytes']} octets", flush=True)
+
+    return {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": {
+            "python": platform.python_version(),
+            "pymupdf": fitz.VersionBind,
+            "machine": platform.machine(),
+            "system": platform.system()
+        },
+        "cases": cases
+    }
+
+def compare_results(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Liste les étapes plus lentes que la référence au-delà de la tolérance
+
+    Retourne des tuples (cas, étape, référence, mesure, écart relatif) ; les
+    cas absents de l'une ou l'autre série sont ignorés.
+    """
+    regressions = []
+    for name, case in results["cases"].items():
+        reference = baseline.get("cases", {}).get(name)
+        if reference is None:
+            continue
+        for stage in COMPARED_METRICS:
+            before = reference["stages"].get(stage)
+            after = case["stages"].get(stage)
+            if not before or after is None:
+                continue
+            delta = (after - before) / before
+            if delta > tolerance:
+                regressions.append((name, stage, before, after, delta))
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Banc de mesure du pipeline d'extraction")
+    parser.add_argument(
+        "-o", "--output", default="bench-results.json",
+        help="fichier JSON des résultats (par défaut bench-results.json)"
+    )
+    parser.add_argument(
+        "--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+        help="nombres de pages des PDF générés, séparés par des virgules"
+    )
+    parser.add_argument(
+        "--kinds", default=",".join(DEFAULT_KINDS),
+        help="variantes de PDF parmi text, scan, mixed"
+    )
+    parser.add_argument(
+        "--receipts", type=int, default=DEFAULT_RECEIPTS,
+        help="nombre de quittances à générer (0 = ne pas mesurer create_receipt.py)"
+    )
+    parser.add_argument(
+        "--baseline", default=None,
+        help="résultats de référence à comparer ; code de sortie 1 en cas de régression"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE,
+        help="ralentissement relatif toléré par étape (0.2 = 20 %%)"
+    )
+    parser.add_argument(
+        "--work-dir", default=None,
+        help="dossier des PDF et sorties générés (par défaut un dossier temporaire supprimé à la fin)"
+    )
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    kinds = [kind.strip() for kind in args.kinds.split(",") if kind.strip()]
+
+    print("⏱ Mesure du pipeline d'extraction...")
+    print("=" * 60)
+
+    if args.work_dir:
+        Path(args.work_dir).mkdir(parents=True, exist_ok=True)
+        results = run_benchmarks(args.work_dir, sizes, kinds, args.receipts)
+    else:
+        with tempfile.TemporaryDirectory(prefix="bench-") as work_dir:
+            results = run_benchmarks(work_dir, sizes, kinds, args.receipts)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n✓ Résultats écrits dans {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.tolerance)
+        for name, stage, before, after, delta in regressions:
+            print(f"⚠ {name} / {stage} : {before:.3f} s → {after:.3f} s ({delta:+.0%})")
+        if regressions:
+            raise SystemExit(1)
+        print(f"✓ Aucune régression par rapport à {args.baseline} (tolérance {args.tolerance:.0%})")
@@ -1,104 +1,390 @@
 #!/usr/bin/env python3
-"""Create a rent receipt image"""
+"""Create rent receipt images
 
-from PIL import Image, ImageDraw, ImageFont
+The receipt layout (texts, coordinates, fonts, rectangles, lines) is described
+once and rendered both as a PNG through Pillow and as a compact SVG.
+Without arguments, draws the exercise receipt (assets/images/page_3_loyer.png/.svg).
+With --batch, renders one personalised receipt per record of a JSON or CSV
+file across a process pool.
+
+Pillow is imported by the raster stages only, so --help starts instantly.
+"""
+
+import argparse
+import csv
+import json
 import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from xml.sax.saxutils import escape as xml_escape
+
+WIDTH, HEIGHT = 800, 1000
+FONT_DIR = "/usr/share/fonts/truetype/dejavu"
+DEFAULT_OUTPUT = 'assets/images/page_3_loyer.png'
+
+# The exercise receipt (Thirion household, September 2025)
+DEFAULT_RECEIPT = {
+    "proprietaire": ["Madame Isabelle MARTIN", "85 Avenue de la Paix", "4020 LIÈGE"],
+    "locataire": ["Monsieur Alex DUPONT", "16 Rue des Lilas", "4000 LIÈGE"],
+    "logement": ["16 Rue des Lilas, Appartement 3B", "4000 LIÈGE"],
+    "mois": "SEPTEMBRE 2025",
+    "montant": 746.00,
+    "date_paiement": "05 septembre 2025",
+    "mode_paiement": "Virement bancaire",
+    "fait_a": "Liège, le 05 septembre 2025",
+    "signature": "I. Martin"
+}
+
+# Fonts of the SVG output (DejaVu first, as in the raster image), as
+# presentation attributes so that non-CSS renderers honour them too
+SVG_FONT_FAMILY = "'DejaVu Sans',Verdana,sans-serif"
+SVG_FONTS = {
+    "title": 'font-size="24" font-weight="bold"',
+    "normal": 'font-size="16"',
+    "small": 'font-size="14"',
+    "amount": 'font-size="18" font-weight="bold"',
+}
+
+# Record fields holding several lines (separated by "|" in CSV files)
+LIST_FIELDS = ("proprietaire", "locataire", "logement")
+
+UNITS = [
+    "zéro", "un", "deux", "trois", "quatre", "cinq", "six", "sept", "huit", "neuf",
+    "dix", "onze", "douze", "treize", "quatorze", "quinze", "seize"
+]
+TENS = {2: "vingt", 3: "trente", 4: "quarante", 5: "cinquante", 6: "soixante"}
+
+
+@lru_cache(maxsize=None)
+def load_fonts():
+    """Load the receipt fonts once per process"""
+    from PIL import ImageFont
+
+    # Try to use a TrueType font, fallback to default if not available
+    try:
+        return {
+            "title": ImageFont.truetype(f"{FONT_DIR}/DejaVuSans-Bold.ttf", 24),
+            "normal": ImageFont.truetype(f"{FONT_DIR}/DejaVuSans.ttf", 16),
+            "small": ImageFont.truetype(f"{FONT_DIR}/DejaVuSans.ttf", 14),
+            "amount": ImageFont.truetype(f"{FONT_DIR}/DejaVuSans-Bold.ttf", 18),
+        }
+    except OSError:
+        # Fallback to default font
+        default = ImageFont.load_default()
+        return {"title": default, "normal": default, "small": default, "amount": default}
+
+
+def _below_hundred(n):
+    """French words for 0 <= n < 100"""
+    if n <= 16:
+        return UNITS[n]
+    if n < 20:
+        return f"dix-{UNITS[n - 10]}"
+    tens, unit = divmod(n, 10)
+    if tens in (7, 9):
+        # soixante-dix, quatre-vingt-dix: the tens word is followed by 10..19
+        prefix = "soixante" if tens == 7 else "quatre-vingt"
+        if n == 71:
+            return "soixante et onze"
+        return f"{prefix}-{_below_hundred(10 + unit)}"
+    if tens == 8:
+        return "quatre-vingts" if unit == 0 else f"quatre-vingt-{UNITS[unit]}"
+    if unit == 0:
+        return TENS[tens]
+    if unit == 1:
+        return f"{TENS[tens]} et un"
+    return f"{TENS[tens]}-{UNITS[unit]}"
+
+
+def _below_thousand(n):
+    """French words for 0 <= n < 1000"""
+    hundreds, rest = divmod(n, 100)
+    if hundreds == 0:
+        return _below_hundred(rest)
+    head = "cent" if hundreds == 1 else f"{UNITS[hundreds]} cent"
+    if rest == 0:
+        return head if hundreds == 1 else f"{head}s"
+    return f"{head} {_below_hundred(rest)}"
+
+
+def number_in_words(n):
+    """French words for a non-negative integer (below one billion)"""
+    if n < 1000:
+        return _below_thousand(n)
+    if n < 1_000_000:
+        thousands, rest = divmod(n, 1000)
+        # "mille" is invariable and "cents"/"vingts" lose their s before it
+        head = _below_thousand(thousands)
+        if head.endswith(("cents", "vingts")):
+            head = head[:-1]
+        head = "mille" if thousands == 1 else f"{head} mille"
+        return head if rest == 0 else f"{head} {_below_thousand(rest)}"
+    millions, rest = divmod(n, 1_000_000)
+    head = "un million" if millions == 1 else f"{number_in_words(millions)} millions"
+    return head if rest == 0 else f"{head} {number_in_words(rest)}"
+
+
+def amount_in_words(amount):
+    """Amount written out in French, e.g. (Sept cent quarante-six euros)"""
+    cents_total = round(amount * 100)
+    euros, cents = divmod(cents_total, 100)
+    # Whole millions take "de": un million d'euros
+    unit = "d'euros" if euros and euros % 1_000_000 == 0 else f"euro{'s' if euros > 1 else ''}"
+    text = f"{number_in_words(euros)} {unit}"
+    if cents:
+        text += f" et {number_in_words(cents)} centime{'s' if cents > 1 else ''}"
+    return f"({text[0].upper()}{text[1:]})"
+
+
+def format_amount(amount):
+    """Amount in Belgian French format, e.g. 1 746,00 €"""
+    return f"{amount:,.2f} €".replace(",", " ").replace(".", ",")
+
+
+def _text(xy, text, font, fill='black', anchor='la'):
+    """Text element of the layout (Pillow anchor: 'la' top-left, 'mm' centred)"""
+    return {"kind": "text", "xy": xy, "text": text, "font": font, "fill": fill, "anchor": anchor}
+
+
+def _rect(box, outline, width, fill=None):
+    """Rectangle element of the layout ([x0, y0, x1, y1], outline drawn inside)"""
+    return {"kind": "rect", "box": box, "outline": outline, "width": width, "fill": fill}
+
+
+def _line(points, fill, width=1):
+    """Line element of the layout ([x0, y0, x1, y1])"""
+    return {"kind": "line", "points": points, "fill": fill, "width": width}
+
+
+# Everything shared by all receipts: border, title, section labels,
+# separator, amount box and signature line
+STATIC_LAYOUT = [
+    _rect([30, 30, WIDTH-30, HEIGHT-30], 'black', 2),
+    _text((WIDTH//2, 60), "QUITTANCE DE LOYER", "title", anchor='mm'),
+    _text((50, 120), "Propriétaire:", "normal"),
+    _text((50, 250), "Locataire:", "normal"),
+    _text((50, 380), "Adresse du logement:", "normal"),
+    _line([50, 475, WIDTH-50, 475], 'gray'),
+    _text((50, 515), "Reçu pour loyer du mois de:", "normal"),
+    _rect([50, 610, WIDTH-50, 730], 'blue', 2, fill='#f0f8ff'),
+    _text((WIDTH//2, 640), "Montant du loyer:", "normal", anchor='mm'),
+    _text((450, 940), "Signature du propriétaire:", "small"),
+    _line([450, 970, 700, 970], 'black'),
+]
+
+
+def variable_layout(receipt=None):
+    """Layout elements that change from one receipt to the next"""
+    receipt = {**DEFAULT_RECEIPT, **(receipt or {})}
+    elements = []
+
+    # Landlord, tenant and property lines under their labels
+    for label_y, field in ((120, "proprietaire"), (250, "locataire"), (380, "logement")):
+        for index, line in enumerate(receipt[field]):
+            elements.append(_text((80, label_y + 30 + 25 * index), line, "small"))
+
+    words = receipt.get("montant_lettres") or amount_in_words(receipt["montant"])
+    elements += [
+        _text((WIDTH//2, 550), receipt["mois"], "title", fill='blue', anchor='mm'),
+        # Amount box contents
+        _text((WIDTH//2, 680), format_amount(receipt["montant"]), "amount", fill='darkblue', anchor='mm'),
+        _text((WIDTH//2, 720), words, "small", anchor='mm'),
+        # Payment details
+        _text((50, 770), f"Date de paiement: {receipt['date_paiement']}", "small"),
+        _text((50, 800), f"Mode de paiement: {receipt['mode_paiement']}", "small"),
+        # Footer and signature
+        _text((50, 880), f"Fait à {receipt['fait_a']}", "small"),
+        _text((575, 980), receipt["signature"], "small", anchor='mm'),
+    ]
+    return elements
+
+
+def _draw(draw, elements):
+    """Raster backend: draw layout elements with Pillow"""
+    fonts = load_fonts()
+    for element in elements:
+        if element["kind"] == "text":
+            draw.text(element["xy"], element["text"], fill=element["fill"],
+                      font=fonts[element["font"]], anchor=element["anchor"])
+        elif element["kind"] == "rect":
+            draw.rectangle(element["box"], outline=element["outline"],
+                           width=element["width"], fill=element["fill"])
+        else:
+            draw.line(element["points"], fill=element["fill"], width=element["width"])
+
+
+def _svg_element(element):
+    """Vector backend: one layout element as an SVG tag"""
+    if element["kind"] == "text":
+        x, y = element["xy"]
+        ascent, descent = load_fonts()[element["font"]].getmetrics()
+        # SVG positions text on its baseline; Pillow on the anchor box
+        baseline = y + ascent if element["anchor"] == 'la' else y + (ascent - descent) / 2
+        attrs = f'x="{x}" y="{baseline:g}" {SVG_FONTS[element["font"]]}'
+        if element["anchor"] == 'mm':
+            attrs += ' text-anchor="middle"'
+        if element["fill"] != 'black':
+            attrs += f' fill="{element["fill"]}"'
+        return f'<text {attrs}>{xml_escape(element["text"])}</text>'
+
+    if element["kind"] == "rect":
+        x0, y0, x1, y1 = element["box"]
+        half = element["width"] / 2
+        # Pillow draws the outline inside the box, SVG centres the stroke on the edge
+        return (f'<rect x="{x0 + half:g}" y="{y0 + half:g}" width="{x1 - x0 + 1 - element["width"]:g}" '
+                f'height="{y1 - y0 + 1 - element["width"]:g}" fill="{element["fill"] or "none"}" '
+                f'stroke="{element["outline"]}" stroke-width="{element["width"]}"/>')
+
+    x0, y0, x1, y1 = element["points"]
+    offset = element["width"] / 2
+    return (f'<line x1="{x0:g}" y1="{y0 + offset:g}" x2="{x1 + 1:g}" y2="{y1 + offset:g}" '
+            f'stroke="{element["fill"]}" stroke-width="{element["width"]}"/>')
+
+
+def render_svg(receipt=None):
+    """Compact SVG of a receipt, from the same layout as the raster image"""
+    body = "".join(_svg_element(element) for element in STATIC_LAYOUT + variable_layout(receipt))
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}" '
+        f'viewBox="0 0 {WIDTH} {HEIGHT}">'
+        f'<rect width="{WIDTH}" height="{HEIGHT}" fill="white"/>'
+        f'<g font-family="{SVG_FONT_FAMILY}">{body}</g></svg>\n'
+    )
+
+
+@lru_cache(maxsize=None)
+def render_static_layer():
+    """Draw everything shared by all receipts once per process"""
+    from PIL import Image, ImageDraw
+
+    # Create a white canvas
+    image = Image.new('RGB', (WIDTH, HEIGHT), 'white')
+    _draw(ImageDraw.Draw(image), STATIC_LAYOUT)
+    return image
+
+
+def render_receipt(receipt=None):
+    """Render one receipt: a copy of the static layer plus the variable fields"""
+    from PIL import ImageDraw
+
+    image = render_static_layer().copy()
+    _draw(ImageDraw.Draw(image), variable_layout(receipt))
+    return image
+
+
+def save_receipt(receipt, png_path, svg_path=None):
+    """Write the raster receipt and, optionally, its SVG twin in the same pass"""
+    render_receipt(receipt).save(png_path)
+    if svg_path:
+        Path(svg_path).write_text(render_svg(receipt), encoding="utf-8")
+
+
+def _warm_up():
+    """Pool initializer: load fonts and draw the static layer once per worker"""
+    render_static_layer()
+
+
+def _render_to_file(job):
+    """Render one batch receipt to disk and return the bytes written"""
+    receipt, output_path, with_svg = job
+    svg_path = Path(output_path).with_suffix(".svg") if with_svg else None
+    save_receipt(receipt, output_path, svg_path)
+    return os.path.getsize(output_path) + (os.path.getsize(svg_path) if svg_path else 0)
+
+
+def parse_amount(text):
+    """Amount from a text cell: 746,00 / 1 234,56 € (as format_amount writes it) / 1.234,56 / 746.00"""
+    cleaned = re.sub(r"[\s€]", "", text)  # \s also covers non-breaking spaces
+    if "," in cleaned:
+        cleaned = cleaned.replace(".", "").replace(",", ".")
+    return float(cleaned)
+
+
+def read_receipts(path):
+    """Read receipt records from a JSON list or a CSV file (";" or "," separated)"""
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        with open(path, encoding="utf-8") as f:
+            records = json.load(f)
+    else:
+        with open(path, encoding="utf-8", newline="") as f:
+            sample = f.read(4096)
+            f.seek(0)
+            dialect = csv.Sniffer().sniff(sample, delimiters=";,")
+            records = [dict(row) for row in csv.DictReader(f, dialect=dialect)]
+        for record in records:
+            for field in LIST_FIELDS:
+                if isinstance(record.get(field), str):
+                    record[field] = record[field].split("|")
+
+    # Both formats may give the amount as text ("746,00")
+    for record in records:
+        if isinstance(record.get("montant"), str) and record["montant"].strip():
+            record["montant"] = parse_amount(record["montant"])
+
+    # Empty cells keep the exercise defaults
+    return [{key: value for key, value in record.items() if value not in ("", None)} for record in records]
+
+
+def render_receipts(receipts, output_dir, workers=1, with_svg=False):
+    """Render many receipts, spreading them over a process pool
+
+    Each record may set "fichier" (output filename); otherwise receipts are
+    numbered quittance_00001.png, ... With with_svg, an SVG is written next
+    to each PNG. Returns the written PNG paths in order and the total size.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [
+        (receipt, str(output_dir / receipt.get("fichier", f"quittance_{index:05d}.png")), with_svg)
+        for index, receipt in enumerate(receipts, start=1)
+    ]
+
+    if workers <= 1:
+        _warm_up()
+        sizes = [_render_to_file(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_warm_up) as executor:
+            # Large chunks keep inter-process traffic low for thousands of receipts
+            chunksize = max(1, len(jobs) // (workers * 8))
+            sizes = list(executor.map(_render_to_file, jobs, chunksize=chunksize))
+
+    return [path for _, path, _ in jobs], sum(sizes)
+
+
+def main(argv=None):
+    """Command line entry point (also reached through extract_pdf.py receipt)"""
+    parser = argparse.ArgumentParser(description="Create rent receipt images")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT,
+                        help="output image (single receipt) or directory (with --batch)")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="JSON or CSV file with one receipt per record")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes for --batch (0 = one per core)")
+    parser.add_argument("--no-svg", action="store_true",
+                        help="only write the PNG (by default an SVG is written next to it)")
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        receipts = read_receipts(args.batch)
+        output_dir = args.output if args.output != DEFAULT_OUTPUT else "receipts"
+        started = time.perf_counter()
+        paths, written = render_receipts(receipts, output_dir, workers=args.workers or os.cpu_count() or 1,
+                                         with_svg=not args.no_svg)
+        elapsed = time.perf_counter() - started
+        print(f"{len(paths)} quittances créées dans {output_dir} "
+              f"({len(paths) / elapsed:.0f} quittances/s, {written} octets)")
+    else:
+        # Save the image (and its SVG twin)
+        svg_path = None if args.no_svg else Path(args.output).with_suffix(".svg")
+        save_receipt(None, args.output, svg_path)
+        print(f"Image créée: {args.output}")
+        if svg_path:
+            print(f"Image créée: {svg_path}")
+
 
-# Create a white canvas
-width, height = 800, 1000
-image = Image.new('RGB', (width, height), 'white')
-draw = ImageDraw.Draw(image)
-
-# Try to use a TrueType font, fallback to default if not available
-try:
-    font_title = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 24)
-    font_normal = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 16)
-    font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 14)
-    font_amount = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 18)
-except:
-    # Fallback to default font
-    font_title = ImageFont.load_default()
-    font_normal = ImageFont.load_default()
-    font_small = ImageFont.load_default()
-    font_amount = ImageFont.load_default()
-
-# Draw border
-draw.rectangle([30, 30, width-30, height-30], outline='black', width=2)
-
-# Title
-draw.text((width//2, 60), "QUITTANCE DE LOYER", fill='black', font=font_title, anchor='mm')
-
-# Landlord info
-y_pos = 120
-draw.text((50, y_pos), "Propriétaire:", fill='black', font=font_normal)
-y_pos += 30
-draw.text((80, y_pos), "Madame Isabelle MARTIN", fill='black', font=font_small)
-y_pos += 25
-draw.text((80, y_pos), "85 Avenue de la Paix", fill='black', font=font_small)
-y_pos += 25
-draw.text((80, y_pos), "4020 LIÈGE", fill='black', font=font_small)
-
-# Tenant info
-y_pos += 50
-draw.text((50, y_pos), "Locataire:", fill='black', font=font_normal)
-y_pos += 30
-draw.text((80, y_pos), "Monsieur Alex DUPONT", fill='black', font=font_small)
-y_pos += 25
-draw.text((80, y_pos), "16 Rue des Lilas", fill='black', font=font_small)
-y_pos += 25
-draw.text((80, y_pos), "4000 LIÈGE", fill='black', font=font_small)
-
-# Property address
-y_pos += 50
-draw.text((50, y_pos), "Adresse du logement:", fill='black', font=font_normal)
-y_pos += 30
-draw.text((80, y_pos), "16 Rue des Lilas, Appartement 3B", fill='black', font=font_small)
-y_pos += 25
-draw.text((80, y_pos), "4000 LIÈGE", fill='black', font=font_small)
-
-# Separator line
-y_pos += 40
-draw.line([50, y_pos, width-50, y_pos], fill='gray', width=1)
-
-# Receipt text
-y_pos += 40
-draw.text((50, y_pos), "Reçu pour loyer du mois de:", fill='black', font=font_normal)
-y_pos += 35
-draw.text((width//2, y_pos), "SEPTEMBRE 2025", fill='blue', font=font_title, anchor='mm')
-
-# Amount box
-y_pos += 60
-box_y1 = y_pos
-box_y2 = y_pos + 120
-draw.rectangle([50, box_y1, width-50, box_y2], outline='blue', width=2, fill='#f0f8ff')
-
-y_pos += 30
-draw.text((width//2, y_pos), "Montant du loyer:", fill='black', font=font_normal, anchor='mm')
-y_pos += 40
-draw.text((width//2, y_pos), "746,00 €", fill='darkblue', font=font_amount, anchor='mm')
-
-y_pos += 40
-draw.text((width//2, y_pos), "(Sept cent quarante-six euros)", fill='black', font=font_small, anchor='mm')
-
-# Payment details
-y_pos = box_y2 + 40
-draw.text((50, y_pos), "Date de paiement: 05 septembre 2025", fill='black', font=font_small)
-y_pos += 30
-draw.text((50, y_pos), "Mode de paiement: Virement bancaire", fill='black', font=font_small)
-
-# Footer
-y_pos += 80
-draw.text((50, y_pos), "Fait à Liège, le 05 septembre 2025", fill='black', font=font_small)
-
-# Signature line
-y_pos += 60
-draw.text((450, y_pos), "Signature du propriétaire:", fill='black', font=font_small)
-y_pos += 30
-draw.line([450, y_pos, 700, y_pos], fill='black', width=1)
-y_pos += 10
-draw.text((575, y_pos), "I. Martin", fill='black', font=font_small, anchor='mm')
-
-# Save the image
-output_path = 'assets/images/page_3_loyer.png'
-image.save(output_path)
-print(f"Image créée: {output_path}")
+if __name__ == "__main__":
+    main()
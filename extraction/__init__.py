@@ -0,0 +1,29 @@
+"""
+Construction des actifs de l'exercice à partir du PDF source
+
+Un module par étape : spec (exercice.toml), pages et render (rendu des
+pages), amounts (montants de la couche texte), data et budget (fichiers
+JSON), sprites, bundle, mirror et verify (sorties annexes), report
+(instrumentation), build (enchaînement et mode lot), watch et cli.
+PyMuPDF, Pillow et brotli ne sont importés que par les étapes qui s'en
+servent ; extract_pdf.py reste le point d'entrée en ligne de commande.
+"""
+from .common import CONTENT_HASH_LENGTH, IMAGE_FORMAT, RENDER_ZOOM, load_fitz, read_json, write_json
+from .spec import (
+    BUDGET_SECTIONS, DEFAULT_SPEC_PATH, EXPENSE_SECTIONS, MAX_AMOUNTS_PER_RUBRIQUE, QUIZ_SECTIONS,
+    document_clips, load_spec, spec_for_pdf
+)
+from .amounts import AMOUNT_PATTERN, check_document_amounts, extract_amounts, parse_amount
+from .store import asset_index
+from .render import VARIANT_FORMATS, VARIANT_WIDTHS, find_page_scan, is_grayscale_page, is_vector_page
+from .pages import cache_dir_for, extract_images_from_pdf, iter_pages, load_extracted_images
+from .bundle import BUNDLE_FILENAME, PRECACHE_FILENAME, write_bundle
+from .sprites import SPRITE_IMAGE, SPRITE_MAP_FILENAME, write_sprite_atlas
+from .mirror import mirror_assets
+from .budget import budget_index, budget_totals, check_budget_consistency, to_cents, to_euros
+from .data import create_budget_json, create_documents_json, create_quiz_json
+from .verify import verify_assets
+from .report import write_build_report
+from .build import build_catalogue, build_exercise, build_stages, find_pdfs
+from .watch import watch
+from .cli import build_parser, main
@@ -0,0 +1,115 @@
+"""Montants en euros relevés dans la couche texte des pages"""
+import json
+import re
+from pathlib import Path
+
+from .common import load_fitz
+
+AMOUNTS_REPORT_FILENAME = "amounts-report.json"
+
+# Montants au format français : 746,00 € / 2102,52€ / 1.234,56 EUR / -2,30
+# Les milliers sont séparés par un point ou une espace insécable (qui reste
+# dans le mot) ; une espace ordinaire sépare deux mots : « Qté 2 746,00 »
+# donne 746,00. Le signe moins touche les chiffres : « Luminus - 61,76 € »
+# est un tiret de séparation
+AMOUNT_PATTERN = re.compile(
+    r"(?<![\d.,\u00a0\u202f])(?P<sign>-)?"
+    r"(?P<number>\d{1,3}(?:[.\u00a0\u202f]\d{3})+,\d{2}|\d+,\d{2})(?![\d,])"
+    r"(?:\s?(?P<currency>€|EUR\b))?"
+)
+
+def parse_amount(match):
+    """Convertit un montant français reconnu par AMOUNT_PATTERN en float"""
+    number = re.sub(r"[.\u00a0\u202f]", "", match.group("number")).replace(",", ".")
+    value = round(float(number), 2)
+    return -value if match.group("sign") else value
+
+def extract_amounts(page, matrix=None):
+    """Repère les montants en euros de la couche texte, avec leur boîte englobante
+    
+    Les mots de page.get_text("words") sont regroupés par ligne ; le libellé
+    proposé pour chaque montant est le texte qui le précède sur la même ligne
+    (depuis le montant précédent).
+    Les boîtes "bbox" sont exprimées en points PDF ; avec la matrice de rendu,
+    "pixelBbox" donne la même zone en pixels de l'image produite.
+    """
+    fitz = load_fitz()
+    lines = {}
+    for x0, y0, x1, y1, word, block_no, line_no, _ in page.get_text("words"):
+        lines.setdefault((block_no, line_no), []).append((x0, y0, x1, y1, word))
+    
+    amounts = []
+    for words in lines.values():
+        words.sort(key=lambda word: word[0])
+        # Texte de la ligne et position de départ de chaque mot
+        starts = []
+        text = ""
+        for word in words:
+            starts.append(len(text))
+            text += word[4] + " "
+        
+        label_start = 0
+        for match in AMOUNT_PATTERN.finditer(text):
+            covered = [
+                word for word, start in zip(words, starts)
+                if start < match.end() and start + len(word[4]) > match.start()
+            ]
+            rect = fitz.Rect(
+                min(word[0] for word in covered), min(word[1] for word in covered),
+                max(word[2] for word in covered), max(word[3] for word in covered)
+            )
+            amount = {
+                "value": parse_amount(match),
+                "text": match.group(0).strip(),
+                "libelle": text[label_start:match.start()].strip(" :-"),
+                "currency": bool(match.group("currency")),
+                "bbox": [round(coord, 2) for coord in rect]
+            }
+            if matrix is not None:
+                # Même transformation que get_pixmap : rotation de la page puis zoom
+                pixel_rect = (rect * page.rotation_matrix * matrix).round()
+                amount["pixelBbox"] = list(pixel_rect)
+            amounts.append(amount)
+            label_start = match.end()
+    
+    return amounts
+
+def check_document_amounts(documents, images, report_dir=None):
+    """Compare les montants déclarés aux montants lus dans la couche texte
+    
+    Pour chaque document, propose les montants et libellés détectés sur sa
+    page et signale les montants déclarés introuvables. Le rapport est écrit
+    dans report_dir/amounts-report.json si report_dir est fourni.
+    """
+    amounts_by_page = {image["page"]: image.get("amounts", []) for image in images}
+    report = []
+    
+    for document in documents:
+        detected = amounts_by_page.get(document["pagePDF"], [])
+        values = [amount["value"] for amount in detected]
+        missing = [
+            montant for montant in document["montants"]
+            if not any(abs(abs(value) - montant) < 0.005 for value in values)
+        ]
+        report.append({
+            "id": document["id"],
+            "pagePDF": document["pagePDF"],
+            "montants": document["montants"],
+            "proposition": {
+                "montants": values,
+                "libelles": [amount["libelle"] for amount in detected]
+            },
+            "verifiable": bool(detected),
+            "absents": missing if detected else []
+        })
+        
+        if not detected:
+            print(f"ℹ {document['id']} : pas de montant dans la couche texte de la page {document['pagePDF']}")
+        elif missing:
+            print(f"⚠ {document['id']} : montants déclarés absents de la page {document['pagePDF']} : {missing}")
+    
+    if report_dir is not None:
+        Path(report_dir).mkdir(parents=True, exist_ok=True)
+        with open(Path(report_dir) / AMOUNTS_REPORT_FILENAME, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
@@ -0,0 +1,89 @@
+"""Calculs du budget en centimes exacts et contrôles de cohérence"""
+from decimal import Decimal
+
+from .spec import BUDGET_SECTIONS, EXPENSE_SECTIONS, MAX_AMOUNTS_PER_RUBRIQUE
+
+def to_cents(amount):
+    """Montant exact en centimes (lu via sa forme décimale, sans erreur binaire)"""
+    value = Decimal(str(amount)).scaleb(2)
+    if value != value.to_integral_value():
+        raise ValueError(f"Montant au-delà du centime : {amount}")
+    return int(value)
+
+def to_euros(cents):
+    """Montant en euros (nombre JSON) à partir de centimes"""
+    return float(Decimal(cents).scaleb(-2))
+
+def budget_totals(budget):
+    """Totaux des entrées, des sorties et solde, calculés en centimes exacts"""
+    entrees = sum(to_cents(rubrique["montantAttendu"]) for rubrique in budget["entrees"])
+    sorties = sum(
+        to_cents(rubrique["montantAttendu"]) for section in EXPENSE_SECTIONS for rubrique in budget[section]
+    )
+    return {
+        "total_entrees": to_euros(entrees),
+        "total_sorties": to_euros(sorties),
+        "solde": to_euros(entrees - sorties)
+    }
+
+def budget_index(budget, documents):
+    """Tables de correction du budget, pour des vérifications en temps constant
+    
+    "montants" : montant en centimes → rubriques candidates ({section, libelle}) ;
+    "documents" : docId → montants du document ; "categories" : section →
+    total et nombre de rubriques.
+    """
+    montants = {}
+    categories = {}
+    for section in BUDGET_SECTIONS:
+        total = 0
+        for rubrique in budget[section]:
+            cents = to_cents(rubrique["montantAttendu"])
+            montants.setdefault(str(cents), []).append({"section": section, "libelle": rubrique["libelle"]})
+            total += cents
+        categories[section] = {"total": to_euros(total), "rubriques": len(budget[section])}
+    return {
+        "montants": montants,
+        "documents": {document["id"]: document["montants"] for document in documents},
+        "categories": categories
+    }
+
+def _amount_combinations(amounts, size):
+    """Sommes (en centimes) de 1 à size montants distincts de la liste"""
+    sums = {0: 0}  # somme → nombre minimal de montants
+    for amount in amounts:
+        for total, count in list(sums.items()):
+            if count < size and sums.get(total + amount, size + 1) > count + 1:
+                sums[total + amount] = count + 1
+    sums.pop(0)
+    return set(sums)
+
+def check_budget_consistency(budget, documents):
+    """Liste les incohérences entre le budget et les montants des documents
+    
+    Chaque rubrique de dépense doit pouvoir être remplie par au plus
+    MAX_AMOUNTS_PER_RUBRIQUE montants de son document source, complétés au
+    besoin par ceux des documents cités par aucune rubrique (détail d'un
+    ticket, par exemple). Les totaux déclarés dans budget.totaux doivent
+    correspondre aux totaux calculés. Les entrées ne proviennent pas des
+    documents et ne sont pas vérifiées.
+    """
+    montants = {document["id"]: [to_cents(montant) for montant in document["montants"]] for document in documents}
+    sources = {rubrique["sourceDocId"] for section in EXPENSE_SECTIONS for rubrique in budget[section]}
+    supporting = [cents for doc_id, amounts in montants.items() if doc_id not in sources for cents in amounts]
+    
+    problems = []
+    for section in EXPENSE_SECTIONS:
+        for rubrique in budget[section]:
+            candidates = montants.get(rubrique["sourceDocId"], []) + supporting
+            if to_cents(rubrique["montantAttendu"]) not in _amount_combinations(candidates, MAX_AMOUNTS_PER_RUBRIQUE):
+                problems.append(
+                    f"budget.{section} « {rubrique['libelle']} » : {rubrique['montantAttendu']} "
+                    f"ne correspond à aucun montant de {rubrique['sourceDocId']}"
+                )
+    
+    computed = budget_totals(budget)
+    for key, declared in budget.get("totaux", {}).items():
+        if key in computed and to_cents(declared) != to_cents(computed[key]):
+            problems.append(f"budget.totaux.{key} : {declared} déclaré, {computed[key]} calculé")
+    return problems
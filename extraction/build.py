@@ -0,0 +1,155 @@
+"""Étapes de construction d'un exercice et mode lot"""
+import glob
+from contextlib import nullcontext
+from pathlib import Path
+
+from .common import timed
+from .spec import document_clips, load_spec, spec_for_pdf
+from .amounts import check_document_amounts
+from .store import output_label
+from .pages import cache_dir_for, iter_pages
+from .bundle import BUNDLE_FILENAME, PRECACHE_FILENAME, write_bundle
+from .sprites import write_sprite_atlas
+from .mirror import mirror_assets
+from .data import create_budget_json, create_documents_json, create_quiz_json
+from .verify import verify_assets
+from .report import json_events, page_event
+
+# Étapes de build_stages, dans l'ordre (les fichiers JSON dépendent des images)
+BUILD_STAGES = ("images", "documents", "budget", "quiz")
+JSON_STAGES = ("documents", "budget", "quiz")
+
+def find_pdfs(sources):
+    """Résout une liste de fichiers, dossiers ou motifs glob en PDF triés"""
+    pdf_paths = []
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            pdf_paths += sorted(path.glob("*.pdf"))
+        elif path.is_file():
+            pdf_paths.append(path)
+        else:
+            pdf_paths += sorted(Path(match) for match in glob.glob(source))
+    # Sans doublons, dans l'ordre de découverte
+    return list(dict.fromkeys(path.resolve() for path in pdf_paths if path.suffix.lower() == ".pdf"))
+
+def build_stages(stages, pdf_path, output_dir, spec, images=(), events=None, json_options=None,
+                 thumbnails=False, verify=False, bundle=False, mirrors=(), verbose=False, **options):
+    """Exécute les étapes demandées de la construction d'un exercice, dans l'ordre
+    
+    Étapes de BUILD_STAGES : "images" rend les pages (iter_pages, options
+    de rendu) et, avec thumbnails, la planche de miniatures ; les étapes
+    JSON écrivent documents/budget/quiz.json à partir des pages rendues ou
+    de images. Ensuite viennent la vérification (verify), le paquet (bundle)
+    puis le reflet dans mirrors. Les événements d'instrumentation sont
+    ajoutés à events ; avec verbose, chaque page est affichée. Retourne les
+    pages, le nombre de pages rendues, les octets écrits et les JSON créés.
+    """
+    output_dir = Path(output_dir)
+    json_options = json_options or {}
+    events = [] if events is None else events
+    result = {"images": list(images), "rendered": 0, "bytes": 0}
+    
+    if "images" in stages:
+        if verbose:
+            print("🚀 Extraction des données du PDF...")
+            print("=" * 60)
+        result["images"] = []
+        for record in iter_pages(pdf_path, output_dir, clips=document_clips(spec["documents"]), **options):
+            events.append(page_event(pdf_path, record))
+            status = record.pop("status")
+            stats = record.pop("stats")
+            result["images"].append(record)
+            if status == "rendered":
+                result["rendered"] += 1
+                result["bytes"] += stats["bytes"]
+            if verbose:
+                if status == "rendered":
+                    print(f"✓ Page {record['page']} extraite: {output_label(record)}", flush=True)
+                else:
+                    print(f"↷ Page {record['page']} inchangée", flush=True)
+        if verbose:
+            print(f"\n📸 {len(result['images'])} pages extraites en images")
+        if thumbnails:
+            write_sprite_atlas(pdf_path, output_dir, spec["documents"], result["images"])
+    images = result["images"]
+    
+    json_stages = [stage for stage in JSON_STAGES if stage in stages]
+    if json_stages and verbose:
+        print("\n📝 Création des fichiers de données...")
+        print("=" * 60)
+    json_seconds = {}
+    if "documents" in stages:
+        with timed(json_seconds, "documents.json"):
+            result["documents"] = create_documents_json(output_dir, images, spec, **json_options)
+        check_document_amounts(result["documents"], images, cache_dir_for(output_dir, options.get("cache_root")))
+    if "budget" in stages:
+        with timed(json_seconds, "budget.json"):
+            result["budget"] = create_budget_json(output_dir, spec, **json_options)
+    if "quiz" in stages:
+        with timed(json_seconds, "quiz.json"):
+            result["quiz"] = create_quiz_json(output_dir, spec, **json_options)
+    events += json_events(pdf_path or "", output_dir, json_seconds)
+    result["bytes"] += sum((output_dir / "data" / filename).stat().st_size for filename in json_seconds)
+    
+    if stages and verify:
+        verify_assets(output_dir, **json_options)
+    if stages and bundle:
+        entries = write_bundle(output_dir, images)
+        result["bytes"] += sum((output_dir / name).stat().st_size for name in (BUNDLE_FILENAME, PRECACHE_FILENAME))
+        if verbose:
+            print(f"✓ {BUNDLE_FILENAME} créé ({len(entries)} fichiers) et {PRECACHE_FILENAME}")
+    # Reflet après l'écriture des JSON, pour ne pas recopier des données périmées
+    for mirror_dir in mirrors:
+        mirror_assets(output_dir, mirror_dir, images)
+        if verbose:
+            print(f"✓ Actifs reflétés dans {mirror_dir}")
+    return result
+
+def build_exercise(pdf_path, output_dir, spec_path=None, json_options=None, thumbnails=False, verify=False,
+                   bundle=False, mirrors=(), **options):
+    """Construit le lot complet d'un exercice (toutes les étapes de build_stages)
+    
+    Retourne un résumé : nombre de pages, pages rendues, octets écrits et
+    événements d'instrumentation ("events", voir write_build_report).
+    """
+    spec = load_spec(spec_path or spec_for_pdf(pdf_path))
+    events = []
+    result = build_stages(
+        BUILD_STAGES, pdf_path, output_dir, spec, events=events, json_options=json_options,
+        thumbnails=thumbnails, verify=verify, bundle=bundle, mirrors=mirrors, **options
+    )
+    return {
+        "pdf": str(pdf_path),
+        "output": str(output_dir),
+        "pages": len(result["images"]),
+        "rendered": result["rendered"],
+        "bytes": result["bytes"],
+        "events": events
+    }
+
+def build_catalogue(pdf_paths, output_root, workers=1, spec_path=None, json_options=None, mirrors=(), **options):
+    """Construit un lot par exercice, tous les PDF partageant un même pool de processus
+    
+    Chaque exercice est écrit dans output_root/<nom du PDF>/ à partir de
+    spec_path, ou à défaut de la spécification propre au PDF, et reflété
+    dans <dossier de mirrors>/<nom du PDF>/. Les PDF sont
+    pilotés l'un après l'autre depuis le thread principal (PyMuPDF ne
+    supporte pas plusieurs threads) et leurs pages rendues par le pool
+    commun ; retourne la liste des résumés de build_exercise.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    pdf_paths = list(pdf_paths)
+    if not pdf_paths:
+        return []
+    
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as pool:
+        return [
+            build_exercise(
+                str(pdf_path), str(Path(output_root) / Path(pdf_path).stem),
+                spec_path=spec_path, json_options=json_options,
+                mirrors=[Path(mirror_dir) / Path(pdf_path).stem for mirror_dir in mirrors],
+                workers=workers, executor=pool, **options
+            )
+            for pdf_path in pdf_paths
+        ]
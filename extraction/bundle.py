@@ -0,0 +1,64 @@
+"""Paquet unique des sorties (assets.bundle) et manifeste de pré-cache"""
+import hashlib
+import json
+from pathlib import Path
+
+from .common import CONTENT_HASH_LENGTH
+from .store import output_filenames
+from .sprites import SPRITE_IMAGE
+
+# Paquet unique des sorties : magie, longueur de l'en-tête JSON (uint32 LE),
+# en-tête (nom → position, longueur, type, empreinte), puis les contenus
+BUNDLE_FILENAME = "assets.bundle"
+BUNDLE_MAGIC = b"BDL1"
+BUNDLE_VERSION = 1
+PRECACHE_FILENAME = "precache-manifest.json"
+CONTENT_TYPES = {
+    ".json": "application/json",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".svg": "image/svg+xml",
+    ".webp": "image/webp",
+    ".avif": "image/avif",
+}
+
+def write_bundle(output_dir, images):
+    """Regroupe les fichiers JSON de data/, les images et la planche de miniatures dans assets.bundle
+    
+    L'en-tête indexe chaque fichier par son chemin servi (assets/...) :
+    position dans la zone de données, longueur, type MIME et SHA-256. Le
+    client peut télécharger le paquet d'un bloc ou n'en lire que des plages
+    (requêtes HTTP Range). precache-manifest.json (liste {url, revision}
+    pour la mise en cache hors ligne) ne désigne que le paquet. Retourne
+    l'index.
+    """
+    output_dir = Path(output_dir)
+    relative_paths = [f"data/{path.name}" for path in sorted((output_dir / "data").glob("*.json"))]
+    relative_paths += [f"images/{filename}" for image in images for filename in output_filenames(image)]
+    if (output_dir / "images" / SPRITE_IMAGE).exists():
+        relative_paths.append(f"images/{SPRITE_IMAGE}")
+    
+    entries = {}
+    contents = []
+    offset = 0
+    # Un fichier partagé par plusieurs pages (adressage par contenu) n'est stocké qu'une fois
+    for relative_path in dict.fromkeys(relative_paths):
+        data = (output_dir / relative_path).read_bytes()
+        entries[f"assets/{relative_path}"] = {
+            "offset": offset,
+            "length": len(data),
+            "type": CONTENT_TYPES.get(Path(relative_path).suffix, "application/octet-stream"),
+            "sha256": hashlib.sha256(data).hexdigest()
+        }
+        contents.append(data)
+        offset += len(data)
+    
+    header = json.dumps({"version": BUNDLE_VERSION, "entries": entries}, separators=(",", ":")).encode("utf-8")
+    bundle = b"".join([BUNDLE_MAGIC, len(header).to_bytes(4, "little"), header] + contents)
+    (output_dir / BUNDLE_FILENAME).write_bytes(bundle)
+    
+    # Le paquet seul : y ajouter ses fichiers les ferait télécharger deux fois
+    precache = [{"url": f"assets/{BUNDLE_FILENAME}", "revision": hashlib.sha256(bundle).hexdigest()[:CONTENT_HASH_LENGTH]}]
+    with open(output_dir / PRECACHE_FILENAME, "w", encoding="utf-8") as f:
+        json.dump(precache, f, ensure_ascii=False, indent=2)
+    return entries
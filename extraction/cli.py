@@ -0,0 +1,262 @@
+"""Ligne de commande : sous-commandes images, data, receipt et all"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from .spec import DEFAULT_SPEC_PATH, load_spec, spec_for_pdf
+from .render import VARIANT_FORMATS, VARIANT_WIDTHS
+from .pages import MANIFEST_FILENAME, load_extracted_images
+from .bundle import BUNDLE_FILENAME, PRECACHE_FILENAME
+from .sprites import SPRITE_IMAGE, SPRITE_MAP_FILENAME
+from .report import write_build_report
+from .build import BUILD_STAGES, JSON_STAGES, build_catalogue, build_stages, find_pdfs
+from .watch import watch
+
+COMMANDS = ("images", "data", "receipt", "all")
+
+def _add_image_arguments(parser, batch=False):
+    """Options de la sous-commande images (reprises par all)"""
+    if batch:
+        parser.add_argument(
+            "pdf", nargs="+",
+            help="PDF source de l'exercice ; un dossier, un motif glob ou plusieurs PDF lancent le mode lot"
+        )
+    else:
+        parser.add_argument("pdf", help="PDF source de l'exercice")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="nombre de processus pour le rendu des pages (0 = nombre de cœurs)"
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="ignorer le manifeste de cache et rendre toutes les pages"
+    )
+    parser.add_argument(
+        "--variants", action="store_true",
+        help="décliner chaque page en plusieurs largeurs (Pillow ; rendu nettement plus lent)"
+    )
+    parser.add_argument(
+        "--formats", default=",".join(VARIANT_FORMATS),
+        help="formats des variantes par ordre de préférence (avif, webp, png), avec --variants"
+    )
+    parser.add_argument(
+        "--content-addressed", action="store_true",
+        help="nommer les images d'après l'empreinte de leur contenu (assets-manifest.json)"
+    )
+    parser.add_argument(
+        "--svg", nargs="?", const="minify", choices=("minify", "raw"),
+        help="exporter en SVG les pages purement vectorielles (minifié par défaut)"
+    )
+    parser.add_argument(
+        "--passthrough", action="store_true",
+        help="recopier tels quels les scans JPEG pleine page au lieu de les rendre"
+    )
+    parser.add_argument(
+        "--reduce-colors", action="store_true",
+        help="écrire les pages en 1 bit, niveaux de gris ou palette quand leur contenu le permet"
+    )
+    parser.add_argument(
+        "--thumbnails", action="store_true",
+        help=f"rendre une miniature par document dans une planche unique ({SPRITE_IMAGE}, {SPRITE_MAP_FILENAME})"
+    )
+
+def _add_data_arguments(parser):
+    """Options de la sous-commande data (reprises par all)"""
+    parser.add_argument(
+        "--minify", action="store_true",
+        help="écrire les fichiers JSON sans indentation"
+    )
+    parser.add_argument(
+        "--compress", action="append", default=[], choices=("gz", "br"),
+        help="ajouter une variante précompressée de chaque JSON (.json.gz, .json.br)"
+    )
+    parser.add_argument(
+        "--verify", action="store_true",
+        help="vérifier les références (images, documents) des JSON et y inscrire les empreintes des images"
+    )
+    parser.add_argument(
+        "--bundle", action="store_true",
+        help=f"regrouper JSON et images dans {BUNDLE_FILENAME} (index en tête) et écrire {PRECACHE_FILENAME}"
+    )
+
+def _add_common_arguments(parser):
+    """Options communes : sortie, spécification, reflet, instrumentation"""
+    parser.add_argument(
+        "-o", "--output", default="public/assets",
+        help="dossier de sortie (images/ et data/), par défaut public/assets ; "
+             "en mode lot, un sous-dossier par exercice"
+    )
+    parser.add_argument(
+        "--spec", default=None,
+        help="spécification TOML des données (par défaut <pdf>.toml s'il existe, sinon exercice.toml)"
+    )
+    parser.add_argument(
+        "--cache-dir", default=None, metavar="DIR",
+        help="dossier des manifestes de cache et rapports de montants, hors des actifs servis (par défaut build/cache)"
+    )
+    parser.add_argument(
+        "--mirror", action="append", default=[], metavar="DIR",
+        help="seconde arborescence d'actifs à synchroniser par liens physiques (ex. assets/)"
+    )
+    parser.add_argument(
+        "--report", default=None, metavar="FILE",
+        help="rapport d'instrumentation par étape et par page (JSON, ou NDJSON si FILE finit par .ndjson)"
+    )
+    parser.add_argument(
+        "--profile", default=None, metavar="FILE",
+        help="profil cProfile du processus principal (pstats) ; avec --workers 1 il couvre aussi le rendu"
+    )
+
+def build_parser():
+    """Analyseur de la ligne de commande (une sous-commande par étape)"""
+    parser = argparse.ArgumentParser(
+        description="Extraction des images et données depuis le PDF source",
+        epilog="Sans sous-commande, « all » est utilisée (extract_pdf.py PDF ...)."
+    )
+    commands = parser.add_subparsers(dest="command", metavar="{images,data,receipt,all}")
+    
+    images = commands.add_parser("images", help="rendre les pages du PDF en images")
+    _add_image_arguments(images)
+    _add_common_arguments(images)
+    
+    data = commands.add_parser("data", help="écrire documents/budget/quiz.json (sans PDF ni PyMuPDF)")
+    data.add_argument(
+        "pdf", nargs="?", default=None,
+        help="PDF de l'exercice, seulement pour trouver <pdf>.toml (le fichier peut être absent)"
+    )
+    _add_data_arguments(data)
+    _add_common_arguments(data)
+    
+    commands.add_parser("receipt", add_help=False, help="générer des quittances (voir create_receipt.py --help)")
+    
+    build = commands.add_parser("all", help="images puis données (défaut)")
+    _add_image_arguments(build, batch=True)
+    _add_data_arguments(build)
+    build.add_argument(
+        "--watch", action="store_true",
+        help="reconstruire en continu les sorties touchées par une modification du PDF, "
+             "de la spécification ou de create_receipt.py"
+    )
+    _add_common_arguments(build)
+    return parser
+
+def _render_options(args):
+    """Options de rendu de iter_pages d'après la ligne de commande"""
+    return {
+        "use_cache": not args.force,
+        "variant_widths": VARIANT_WIDTHS if args.variants else (),
+        "variant_formats": tuple(fmt.strip() for fmt in args.formats.split(",") if fmt.strip()),
+        "content_addressed": args.content_addressed,
+        "vector": {"minify": "minify", "raw": True}.get(args.svg, False),
+        "passthrough": args.passthrough,
+        "reduce_colors": args.reduce_colors,
+        "cache_root": args.cache_dir
+    }
+
+def _run_batch(args, events):
+    """Mode lot : un exercice par PDF, pages rendues par un pool commun"""
+    workers = args.workers or os.cpu_count() or 1
+    unmatched = [source for source in args.pdf if not find_pdfs([source])]
+    if unmatched:
+        build_parser().error(f"aucun PDF trouvé pour : {', '.join(unmatched)}")
+    pdf_paths = find_pdfs(args.pdf)
+    print(f"🚀 Construction de {len(pdf_paths)} exercices ({workers} processus)...")
+    print("=" * 60)
+    
+    started = time.perf_counter()
+    summaries = build_catalogue(
+        pdf_paths, args.output, workers=workers, spec_path=args.spec,
+        json_options={"minify": args.minify, "compress": tuple(args.compress)},
+        thumbnails=args.thumbnails, verify=args.verify, bundle=args.bundle, mirrors=args.mirror,
+        **_render_options(args)
+    )
+    elapsed = time.perf_counter() - started
+    
+    for summary in summaries:
+        print(f"✓ {Path(summary['pdf']).name} → {summary['output']} "
+              f"({summary['rendered']}/{summary['pages']} pages rendues, {summary['bytes']} octets)")
+        events += summary["events"]
+    
+    pages = sum(summary["pages"] for summary in summaries)
+    rendered = sum(summary["rendered"] for summary in summaries)
+    written = sum(summary["bytes"] for summary in summaries)
+    print(f"\n✅ {len(summaries)} exercices construits en {elapsed:.2f} s")
+    print(f"   - {pages} pages ({rendered} rendues), {rendered / elapsed if elapsed else 0:.1f} pages/s")
+    print(f"   - {written} octets écrits ({written / elapsed / 1e6 if elapsed else 0:.1f} Mo/s)")
+
+def _run_single(args, events):
+    """Sous-commandes images, data et all sur un seul PDF (étapes de build_stages)"""
+    pdf_path = args.pdf[0] if isinstance(args.pdf, list) else args.pdf
+    spec = load_spec(args.spec or (spec_for_pdf(pdf_path) if pdf_path else DEFAULT_SPEC_PATH))
+    stages = {"images": ("images",), "data": JSON_STAGES, "all": BUILD_STAGES}[args.command]
+    
+    images = []
+    json_options = {}
+    if args.command == "data":
+        # Sans PDF : les pages viennent du manifeste de cache
+        images = load_extracted_images(args.output, args.cache_dir)
+        if not images:
+            print(f"ℹ Pas de {MANIFEST_FILENAME} pour {args.output} : documents.json sans variantes ni zones")
+        options = {"cache_root": args.cache_dir}
+    else:
+        options = dict(_render_options(args), workers=args.workers or os.cpu_count() or 1)
+    if args.command != "images":
+        json_options = {"minify": args.minify, "compress": tuple(args.compress)}
+    
+    result = build_stages(
+        stages, pdf_path, args.output, spec, images=images, events=events, json_options=json_options,
+        thumbnails=getattr(args, "thumbnails", False), verify=getattr(args, "verify", False),
+        bundle=getattr(args, "bundle", False), mirrors=args.mirror, verbose=True, **options
+    )
+    if args.command == "images":
+        return
+    
+    budget = result["budget"]
+    print("\n✅ Extraction terminée !")
+    print(f"   - {len(result['images'])} images extraites")
+    print(f"   - {len(result['documents'])} documents référencés")
+    print(f"   - {len(budget['entrees']) + len(budget['sorties_fixes']) + len(budget['sorties_variables'])} rubriques budgétaires")
+    print(f"   - {len(result['quiz']['partie1_documents']) + len(result['quiz']['partie3_final'])} questions de quiz")
+
+def main(argv=None):
+    """Point d'entrée : extract_pdf.py {images,data,receipt,all} ..."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["receipt"]:
+        # Les quittances gardent leur propre interface (Pillow chargé là seulement)
+        from create_receipt import main as receipt_main
+        return receipt_main(argv[1:])
+    if not argv or argv[0] not in COMMANDS + ("-h", "--help"):
+        # Compatibilité : extract_pdf.py PDF ... équivaut à extract_pdf.py all PDF ...
+        argv = ["all"] + argv
+    args = build_parser().parse_args(argv)
+    
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    
+    events = []
+    if args.command == "all" and args.watch:
+        if len(args.pdf) > 1 or not Path(args.pdf[0]).is_file():
+            build_parser().error("--watch s'utilise avec un seul fichier PDF")
+        watch(
+            args.pdf[0], args.output, spec_path=args.spec, workers=args.workers or os.cpu_count() or 1,
+            json_options={"minify": args.minify, "compress": tuple(args.compress)},
+            mirrors=args.mirror, bundle=args.bundle, thumbnails=args.thumbnails,
+            verify=args.verify, **_render_options(args)
+        )
+    elif args.command == "all" and (len(args.pdf) > 1 or not Path(args.pdf[0]).is_file()):
+        _run_batch(args, events)
+    else:
+        _run_single(args, events)
+    
+    if args.report:
+        write_build_report(args.report, events)
+        print(f"✓ Rapport d'instrumentation écrit dans {args.report}")
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        print(f"✓ Profil écrit dans {args.profile}")
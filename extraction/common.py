@@ -0,0 +1,97 @@
+"""Constantes de rendu et utilitaires partagés (empreintes, mesures, JSON, imports paresseux)"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+# Racine du projet (exercice.toml, create_receipt.py, build/)
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+# Paramètres de rendu (enregistrés dans le manifeste de cache)
+RENDER_ZOOM = 2  # 2x zoom pour meilleure qualité
+IMAGE_FORMAT = "png"
+
+# Noms de fichiers adressés par contenu : préfixe hexadécimal du SHA-256
+CONTENT_HASH_LENGTH = 16
+CONTENT_HASH_PATTERN = re.compile(rf"[0-9a-f]{{{CONTENT_HASH_LENGTH}}}")
+
+def file_sha256(path):
+    """Calcule l'empreinte SHA-256 d'un fichier par blocs"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+@contextmanager
+def timed(seconds, stage):
+    """Ajoute la durée du bloc à seconds[stage] (instrumentation par étape)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds[stage] = seconds.get(stage, 0.0) + time.perf_counter() - started
+
+@lru_cache(maxsize=None)
+def load_fitz():
+    """PyMuPDF, importé à la première étape qui rend ou lit le PDF (ni data ni --help)"""
+    import fitz
+    return fitz
+
+@lru_cache(maxsize=None)
+def load_pillow():
+    """Pillow (Image, features), importé à la première image à produire
+    
+    Optionnel : sans lui, (None, None) et pas de variantes redimensionnées.
+    """
+    try:
+        from PIL import Image, features
+    except ImportError:
+        return None, None
+    return Image, features
+
+def link_or_copy(source, target):
+    """Lie physiquement source à target (copie à défaut), sauf si target est déjà identique"""
+    if target.exists() and (target.samefile(source) or target.read_bytes() == source.read_bytes()):
+        return
+    target.unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+def write_json(path, data, minify=False, compress=()):
+    """Écrit un fichier JSON (indenté ou minifié) et ses variantes précompressées"""
+    if minify:
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    else:
+        payload = json.dumps(data, ensure_ascii=False, indent=2)
+    payload = payload.encode("utf-8")
+    Path(path).write_bytes(payload)
+    
+    for encoding in compress:
+        if encoding == "gz":
+            Path(f"{path}.gz").write_bytes(gzip.compress(payload, compresslevel=9, mtime=0))
+        elif encoding == "br":
+            try:
+                import brotli
+            except ImportError:  # compression .br optionnelle
+                print(f"⚠ Module brotli absent : {Path(path).name}.br non créé")
+                continue
+            Path(f"{path}.br").write_bytes(brotli.compress(payload, quality=11))
+        else:
+            raise ValueError(f"Compression inconnue : {encoding}")
+
+def read_json(path):
+    """Contenu d'un fichier JSON, ou None s'il est absent"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,103 @@
+"""Écriture de documents.json, budget.json et quiz.json"""
+from pathlib import Path
+
+from .common import IMAGE_FORMAT, write_json
+from .spec import load_spec
+from .budget import budget_index, budget_totals, check_budget_consistency
+
+def _document_hotspots(montants, amounts, crop=None):
+    """Associe chaque montant déclaré à une zone détectée distincte (ou None)
+    
+    Pour un document recadré, les zones sont ramenées au repère du recadrage
+    et celles qui en sortent sont ignorées.
+    """
+    origin_x, origin_y = crop["origin"] if crop else (0, 0)
+    available = [
+        amount for amount in amounts if "pixelBbox" in amount and (crop is None or (
+            amount["pixelBbox"][0] >= origin_x and amount["pixelBbox"][1] >= origin_y
+            and amount["pixelBbox"][2] <= origin_x + crop["width"]
+            and amount["pixelBbox"][3] <= origin_y + crop["height"]))
+    ]
+    hotspots = []
+    for montant in montants:
+        match = next((amount for amount in available if abs(abs(amount["value"]) - montant) < 0.005), None)
+        if match is None:
+            hotspots.append(None)
+            continue
+        available.remove(match)
+        x0, y0, x1, y1 = match["pixelBbox"]
+        hotspots.append({"x": x0 - origin_x, "y": y0 - origin_y, "width": x1 - x0, "height": y1 - y0})
+    return hotspots
+
+def create_documents_json(output_dir, images=None, spec=None, **json_options):
+    """Crée le fichier documents.json avec les métadonnées
+    
+    Si la liste des images extraites est fournie, la table "variants" de
+    chaque page est recopiée dans les documents qui l'affichent, et
+    imagePath pointe vers le fichier réel (nommé par contenu le cas échéant).
+    Chaque montant retrouvé dans la couche texte reçoit aussi sa zone en
+    pixels de l'image pleine résolution ("hotspots", alignés sur montants).
+    Un document recadré (champ "clip" de la spécification) pointe vers son
+    image propre.
+    """
+    documents = (spec or load_spec())["documents"]
+    
+    # Les documents désignent toujours la page par son nom PNG logique
+    images_by_path = {
+        f"assets/images/page_{image['page']}.{IMAGE_FORMAT}": image for image in images or []
+    }
+    for document in documents:
+        document.pop("clip", None)
+        image = images_by_path.get(document["imagePath"])
+        if image is None:
+            continue
+        # Document recadré : son image propre remplace la page partagée
+        crop = image.get("crops", {}).get(document["id"])
+        output = crop or image
+        document["imagePath"] = output["path"]
+        if output.get("variants"):
+            document["variants"] = output["variants"]
+        if image.get("amounts"):
+            document["imageSize"] = {"width": output["width"], "height": output["height"]}
+            document["hotspots"] = _document_hotspots(document["montants"], image["amounts"], crop)
+    
+    data_dir = Path(output_dir) / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    
+    write_json(data_dir / "documents.json", documents, **json_options)
+    
+    print(f"✓ documents.json créé avec {len(documents)} documents")
+    return documents
+
+def create_budget_json(output_dir, spec=None, **json_options):
+    """Crée le fichier budget.json avec les rubriques
+    
+    Les totaux sont calculés à partir des rubriques et la table "index"
+    (voir budget_index) est ajoutée ; un budget incohérent avec les montants
+    des documents (voir check_budget_consistency) lève une ValueError.
+    """
+    spec = spec or load_spec()
+    budget = spec["budget"]
+    problems = check_budget_consistency(budget, spec["documents"])
+    if problems:
+        raise ValueError("Budget incohérent avec les documents :\n  " + "\n  ".join(problems))
+    budget["totaux"] = budget_totals(budget)
+    budget["index"] = budget_index(budget, spec["documents"])
+    
+    data_dir = Path(output_dir) / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    write_json(data_dir / "budget.json", budget, **json_options)
+    
+    print("✓ budget.json créé")
+    return budget
+
+def create_quiz_json(output_dir, spec=None, **json_options):
+    """Crée le fichier quiz.json"""
+    quiz = (spec or load_spec())["quiz"]
+    
+    data_dir = Path(output_dir) / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    write_json(data_dir / "quiz.json", quiz, **json_options)
+    
+    print("✓ quiz.json créé")
+    return quiz
@@ -0,0 +1,30 @@
+"""Reflet des sorties dans une seconde arborescence d'actifs"""
+from pathlib import Path
+
+from .common import link_or_copy
+from .store import collect_unreferenced, output_filenames
+from .bundle import BUNDLE_FILENAME, PRECACHE_FILENAME
+from .sprites import SPRITE_IMAGE
+
+def mirror_assets(output_dir, mirror_dir, images):
+    """Reflète images, JSON de data/, planche de miniatures et paquet dans une seconde arborescence
+    
+    Les fichiers sont liés physiquement (hard link) au magasin quand le système
+    de fichiers le permet, copiés sinon ; rien n'est réécrit s'ils existent déjà.
+    Les fichiers adressés par contenu qui ne sont plus référencés sont retirés
+    du miroir comme du magasin.
+    """
+    source_dir = Path(output_dir)
+    target_dir = Path(mirror_dir)
+    (target_dir / "images").mkdir(parents=True, exist_ok=True)
+    (target_dir / "data").mkdir(parents=True, exist_ok=True)
+    
+    relative_paths = [f"images/{filename}" for image in images for filename in output_filenames(image)]
+    relative_paths += [f"data/{path.name}" for path in sorted((source_dir / "data").glob("*.json*"))]
+    relative_paths += [
+        name for name in (f"images/{SPRITE_IMAGE}", BUNDLE_FILENAME, PRECACHE_FILENAME)
+        if (source_dir / name).exists()
+    ]
+    for relative_path in relative_paths:
+        link_or_copy(source_dir / relative_path, target_dir / relative_path)
+    collect_unreferenced(target_dir / "images", images)
@@ -0,0 +1,194 @@
+"""Extraction des pages en flux, avec manifeste de cache et pool de processus"""
+import hashlib
+import json
+import re
+from contextlib import nullcontext
+from pathlib import Path
+
+from .common import PROJECT_DIR, file_sha256, load_fitz
+from .amounts import AMOUNTS_REPORT_FILENAME
+from .store import collect_unreferenced, output_filenames, output_label, write_asset_manifest
+from .render import (
+    VARIANT_FORMATS, iter_rendered_pages, page_sha256, render_pages, render_params, select_variant_format, split_pages
+)
+
+# Manifeste de cache : empreintes du PDF et des pages, paramètres de rendu
+MANIFEST_FILENAME = "images-manifest.json"
+MANIFEST_VERSION = 4
+# Manifeste de cache et rapport des montants : fichiers de construction,
+# rangés hors des actifs servis (un sous-dossier par dossier de sortie)
+CACHE_ROOT = PROJECT_DIR / "build" / "cache"
+
+def _load_manifest(manifest_path):
+    """Charge le manifeste de cache, ou None s'il est absent ou illisible"""
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+def cache_dir_for(output_dir, cache_root=None):
+    """Dossier des fichiers de construction d'un dossier de sortie, sous cache_root (CACHE_ROOT)"""
+    key = re.sub(r"[^\w.-]+", "_", str(Path(output_dir).resolve())).strip("_")
+    return Path(cache_root or CACHE_ROOT) / key
+
+def iter_pages(pdf_path, output_dir, workers=1, use_cache=True,
+               variant_widths=(), variant_formats=VARIANT_FORMATS,
+               content_addressed=False, vector=False, passthrough=False, reduce_colors=False,
+               clips=None, executor=None, cache_root=None):
+    """Extrait les pages du PDF et produit leurs enregistrements au fil de l'eau
+    
+    Un enregistrement par page, dans l'ordre, dès qu'elle est écrite ("status" :
+    "rendered" ou "cached", "stats" : mesures). Options : voir le README.
+    """
+    fitz = load_fitz()
+    from concurrent.futures import ProcessPoolExecutor
+    images_dir = Path(output_dir) / "images"
+    clips = clips or {}
+    manifest_path = cache_dir_for(output_dir, cache_root) / MANIFEST_FILENAME
+    variant_format = select_variant_format(variant_formats) if variant_widths else None
+    if variant_widths and variant_format is None:
+        print("⚠ Pillow absent : variantes redimensionnées désactivées")
+        variant_widths = ()
+    params = render_params(
+        variant_widths, variant_format, content_addressed, vector, passthrough, reduce_colors
+    )
+    pdf_hash = file_sha256(pdf_path)
+    
+    manifest = _load_manifest(manifest_path) if use_cache else None
+    cached_pages = {}
+    if manifest and manifest.get("render") == params:
+        cached_pages = {entry["page"]: entry for entry in manifest.get("pages", [])}
+    
+    # PDF identique : rien à ouvrir ni à rendre si toutes les images sont présentes
+    if (manifest and cached_pages and manifest.get("pdf", {}).get("sha256") == pdf_hash
+            and manifest.get("clips", {}) == {str(page): crops for page, crops in clips.items()}
+            and all((images_dir / filename).exists()
+                    for entry in cached_pages.values() for filename in output_filenames(entry))):
+        extracted_images = []
+        for page_number in sorted(cached_pages):
+            image = {key: value for key, value in cached_pages[page_number].items() if key != "sha256"}
+            extracted_images.append(image)
+            yield dict(image, status="cached", stats={})
+        if content_addressed:
+            write_asset_manifest(output_dir, extracted_images)
+        return
+    
+    with fitz.open(pdf_path) as doc:
+        page_hashes = [page_sha256(doc, doc[page_num]) for page_num in range(len(doc))]
+    
+    # Les recadrages demandés font partie de l'empreinte de leur page
+    for page_num, page_hash in enumerate(page_hashes):
+        if clips.get(page_num + 1):
+            signature = json.dumps(clips[page_num + 1], sort_keys=True)
+            page_hashes[page_num] = hashlib.sha256(f"{page_hash}|{signature}".encode()).hexdigest()
+    
+    # Créer le répertoire de sortie
+    images_dir.mkdir(parents=True, exist_ok=True)
+    
+    to_render = []
+    for page_num, page_hash in enumerate(page_hashes):
+        cached = cached_pages.get(page_num + 1)
+        if (cached is None or cached["sha256"] != page_hash
+                or not all((images_dir / filename).exists() for filename in output_filenames(cached))):
+            to_render.append(page_num)
+    
+    extracted_images = []
+    if executor is not None or workers <= 1 or not to_render:
+        pool = nullcontext(executor if to_render else None)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    
+    with pool as executor:
+        # Pages modifiées rendues dans l'ordre (map() restitue les tranches dans l'ordre de soumission)
+        if executor is None:
+            rendered = iter_rendered_pages(pdf_path, str(images_dir), to_render, params, clips)
+        else:
+            chunks = split_pages(to_render, max(workers, 1))
+            rendered = (
+                image
+                for chunk in executor.map(
+                    render_pages,
+                    [pdf_path] * len(chunks),
+                    [str(images_dir)] * len(chunks),
+                    chunks,
+                    [params] * len(chunks),
+                    [clips] * len(chunks)
+                )
+                for image in chunk
+            )
+        
+        pending = set(to_render)
+        for page_num in range(len(page_hashes)):
+            if page_num in pending:
+                image = next(rendered)
+                stats = image.pop("stats")
+                status = "rendered"
+            else:
+                cached = cached_pages[page_num + 1]
+                image = {key: value for key, value in cached.items() if key != "sha256"}
+                stats = {}
+                status = "cached"
+            extracted_images.append(image)
+            yield dict(image, status=status, stats=stats)
+    
+    if content_addressed:
+        # Les fichiers peuvent être partagés : on ne retire que ceux qui ne servent plus
+        collect_unreferenced(images_dir, extracted_images)
+        write_asset_manifest(output_dir, extracted_images)
+    else:
+        # Supprimer les images de pages qui n'existent plus dans le PDF
+        for page_number, entry in cached_pages.items():
+            if page_number > len(page_hashes):
+                for filename in output_filenames(entry):
+                    (images_dir / filename).unlink(missing_ok=True)
+    
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "pdf": {"name": Path(pdf_path).name, "sha256": pdf_hash},
+        "render": params,
+        "clips": {str(page): crops for page, crops in clips.items()},
+        "pages": [
+            dict(image, sha256=page_hash)
+            for image, page_hash in zip(extracted_images, page_hashes)
+        ]
+    }
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    # Ancien emplacement, dans les actifs servis
+    for name in (MANIFEST_FILENAME, AMOUNTS_REPORT_FILENAME):
+        (Path(output_dir) / name).unlink(missing_ok=True)
+
+def load_extracted_images(output_dir, cache_root=None):
+    """Pages déjà extraites d'après le manifeste de cache (liste vide sans manifeste)
+    
+    Permet de régénérer les JSON sans le PDF ni PyMuPDF.
+    """
+    manifest = _load_manifest(cache_dir_for(output_dir, cache_root) / MANIFEST_FILENAME)
+    if manifest is None:
+        return []
+    return [
+        {key: value for key, value in entry.items() if key != "sha256"}
+        for entry in manifest.get("pages", [])
+    ]
+
+def extract_images_from_pdf(pdf_path, output_dir, **options):
+    """Extrait les images et crée des captures d'écran de chaque page
+    
+    Variante non streamée de iter_pages (mêmes options) : retourne la liste
+    complète des pages, triée dans l'ordre du PDF.
+    """
+    extracted_images = []
+    for record in iter_pages(pdf_path, output_dir, **options):
+        status = record.pop("status")
+        record.pop("stats")
+        extracted_images.append(record)
+        if status == "rendered":
+            print(f"✓ Page {record['page']} extraite: {output_label(record)}")
+        else:
+            print(f"↷ Page {record['page']} inchangée")
+    return extracted_images
@@ -0,0 +1,437 @@
+"""Rendu d'une page : bitmap, SVG, scan recopié, recadrages et variantes"""
+import hashlib
+import io
+import operator
+import re
+import time
+from pathlib import Path
+
+from .common import IMAGE_FORMAT, RENDER_ZOOM, load_fitz, load_pillow, timed
+from .amounts import extract_amounts
+from .store import image_entry, store_output, written_bytes
+
+# Part minimale de la page couverte par un scan recopié tel quel
+SCAN_COVERAGE = 0.9
+
+# Réduction de la profondeur de couleur : zoom de l'aperçu d'analyse, écart
+# maximal entre canaux d'un pixel « gris », marge et part tolérée de pixels
+# intermédiaires pour une page noir et blanc (anticrénelage du texte)
+PROBE_ZOOM = 0.25
+GRAY_TOLERANCE = 8
+BILEVEL_MARGIN = 32
+BILEVEL_TOLERANCE = 0.005
+
+# Recadrage automatique : écart maximal entre blocs d'un même document et marge (points PDF)
+CLIP_GAP = 18
+CLIP_MARGIN = 12
+
+# Variantes servies au jeu : miniature, écran, impression (largeurs en pixels)
+VARIANT_WIDTHS = (240, 800, 1600)
+# Formats par ordre de préférence ; le PNG pleine résolution reste le repli
+VARIANT_FORMATS = ("webp",)
+VARIANT_SAVE_OPTIONS = {
+    "avif": {"quality": 60},
+    "webp": {"quality": 80, "method": 4},
+    "png": {"optimize": True},
+}
+
+def _xref_key(doc, xref, key):
+    """Numéro xref d'une entrée indirecte (« 12 0 R ») d'un objet, ou 0"""
+    kind, value = doc.xref_get_key(xref, key)
+    return int(value.split()[0]) if kind == "xref" else 0
+
+def page_sha256(doc, page):
+    """Empreinte d'une page à partir des objets xref qui déterminent son rendu"""
+    digest = hashlib.sha256()
+    digest.update(f"{tuple(page.rect)}|{page.rotation}".encode())
+    
+    # Objet page (dont ses ressources et ses annotations en ligne), flux de
+    # contenu, ressources indirectes, polices, images, XObjects, puis chaque
+    # annotation et son apparence (get_pixmap dessine les annotations)
+    xrefs = [page.xref, *page.get_contents(), _xref_key(doc, page.xref, "Resources")]
+    prefix = "" if xrefs[-1] else "Resources/"
+    xrefs += [_xref_key(doc, xrefs[-1] or page.xref, prefix + key) for key in ("Font", "XObject", "ExtGState")]
+    for font in page.get_fonts(full=True):
+        xrefs += [font[0], *(_xref_key(doc, font[0], f"FontDescriptor/{key}")
+                             for key in ("FontFile", "FontFile2", "FontFile3"))]
+    xrefs += [image[0] for image in page.get_images(full=True)]
+    xrefs += [xobject[0] for xobject in page.get_xobjects()]
+    for annot_xref in page.annot_xrefs():
+        xrefs += [annot_xref[0], _xref_key(doc, annot_xref[0], "AP/N")]
+    for xref in xrefs:
+        if xref <= 0:
+            continue
+        digest.update(doc.xref_object(xref, compressed=True).encode())
+        if doc.xref_is_stream(xref):
+            digest.update(doc.xref_stream_raw(xref) or b"")
+    
+    return digest.hexdigest()
+
+def render_params(variant_widths=(), variant_format=None, content_addressed=False, vector=False,
+                   passthrough=False, reduce_colors=False):
+    """Paramètres de rendu comparés d'une exécution à l'autre (et transmis aux workers)"""
+    return {
+        "matrix": [RENDER_ZOOM, RENDER_ZOOM],
+        "format": IMAGE_FORMAT,
+        "variants": {"widths": list(variant_widths), "format": variant_format},
+        "contentAddressed": content_addressed,
+        "vector": vector,
+        "passthrough": passthrough,
+        "reduceColors": reduce_colors
+    }
+
+def select_variant_format(formats):
+    """Premier format de la liste pris en charge par Pillow (None sans Pillow)"""
+    Image, pil_features = load_pillow()
+    if Image is None:
+        return None
+    for fmt in formats:
+        if fmt == "png" or pil_features.check(fmt):
+            return fmt
+    return "png"
+
+def _write_variants(pix, images_dir, stem, params):
+    """Écrit les variantes redimensionnées d'une image et retourne leur table"""
+    Image, _ = load_pillow()
+    widths = params["variants"]["widths"]
+    fmt = params["variants"]["format"]
+    mode = "RGBA" if pix.alpha else ("L" if pix.n == 1 else "RGB")
+    # Vue sur les échantillons de la pixmap, sans copie intermédiaire
+    full = Image.frombuffer(mode, (pix.width, pix.height), pix.samples_mv, "raw", mode, pix.stride, 1)
+    variants = {}
+    
+    # Largeurs supérieures au rendu ramenées à la pleine résolution (pas d'agrandissement)
+    for width in sorted({min(width, pix.width) for width in widths}):
+        height = max(1, round(pix.height * width / pix.width))
+        resized = full if width == pix.width else full.resize((width, height), Image.LANCZOS)
+        
+        buffer = io.BytesIO()
+        resized.save(buffer, format=fmt.upper(), **VARIANT_SAVE_OPTIONS[fmt])
+        name = f"{stem}-{width}w.{fmt}"
+        filename = store_output(images_dir, name, buffer.getvalue(), params["contentAddressed"])
+        variants[str(width)] = {
+            "path": f"assets/images/{filename}",
+            "bytes": buffer.tell(),
+            "format": fmt
+        }
+        if params["contentAddressed"]:
+            variants[str(width)]["name"] = name
+    
+    return variants
+
+def _resolve_clip(page, crop, amounts):
+    """Zone de recadrage d'un document en points PDF (None si indéterminable)
+    
+    Une zone explicite est bornée à la page. Avec "auto", la zone part des
+    blocs de texte contenant les montants déclarés du document et s'étend
+    aux blocs voisins (à moins de CLIP_GAP points), puis reçoit une marge.
+    """
+    fitz = load_fitz()
+    if crop["clip"] != "auto":
+        rect = fitz.Rect(crop["clip"]) & page.rect
+        return None if rect.is_empty else rect
+    
+    amount_rects = [
+        fitz.Rect(amount["bbox"]) for amount in amounts
+        if any(abs(abs(amount["value"]) - montant) < 0.005 for montant in crop["montants"])
+    ]
+    blocks = [fitz.Rect(block[:4]) for block in page.get_text("blocks")]
+    region = fitz.Rect()
+    for block in blocks:
+        if any(block.intersects(rect) for rect in amount_rects):
+            region |= block
+    if region.is_empty:
+        return None
+    
+    grown = True
+    while grown:
+        grown = False
+        reach = region + (-CLIP_GAP, -CLIP_GAP, CLIP_GAP, CLIP_GAP)
+        for block in blocks:
+            if block.intersects(reach) and not region.contains(block):
+                region |= block
+                grown = True
+    
+    return (region + (-CLIP_MARGIN, -CLIP_MARGIN, CLIP_MARGIN, CLIP_MARGIN)) & page.rect
+
+def _render_crop(page, matrix, rect, doc_id, images_dir, params, gray=False):
+    """Rend uniquement la zone d'un document (get_pixmap avec clip)"""
+    fitz = load_fitz()
+    pix = page.get_pixmap(matrix=matrix, clip=rect, colorspace=fitz.csGRAY if gray else fitz.csRGB)
+    name = f"doc_{doc_id}.{IMAGE_FORMAT}"
+    if params["reduceColors"]:
+        data, _ = _encode_reduced(pix)
+    else:
+        data = pix.tobytes(IMAGE_FORMAT)
+    filename = store_output(images_dir, name, data, params["contentAddressed"])
+    crop = {
+        "filename": filename,
+        "path": f"assets/images/{filename}",
+        "bytes": len(data),
+        "width": pix.width,
+        "height": pix.height,
+        # Coin supérieur gauche dans le repère pixel de la page pleine
+        "origin": [pix.x, pix.y],
+        "clip": [round(coord, 2) for coord in rect]
+    }
+    if filename != name:
+        crop["name"] = name
+    if params["variants"]["widths"] and params["variants"]["format"]:
+        crop["variants"] = _write_variants(pix, images_dir, f"doc_{doc_id}", params)
+    return crop
+
+def is_vector_page(page):
+    """Vrai si la page ne contient aucune image matricielle (ni XObject ni image en ligne)"""
+    return not page.get_image_info()
+
+def _minify_svg(svg):
+    """Allège le SVG de MuPDF : espaces entre balises et décimales superflues"""
+    svg = re.sub(r">\s+<", "><", svg.strip())
+    return re.sub(r"(\d+\.\d{2})\d+", r"\1", svg)
+
+def find_page_scan(doc, page):
+    """Repère une page qui n'est qu'un scan JPEG pleine page
+    
+    Conditions : une seule image, encodée en DCTDecode (JPEG lisible tel quel
+    par les navigateurs, hors CMYK), sans masque, posée droite et couvrant
+    presque toute la page, sans tracé vectoriel ni texte visible par-dessus
+    (une couche OCR invisible est admise). Retourne le xref de l'image et la
+    matrice points PDF → pixels de l'image, ou None.
+    """
+    fitz = load_fitz()
+    if page.rotation:
+        return None
+    images = page.get_images(full=True)
+    infos = page.get_image_info(xrefs=True)
+    if len(images) != 1 or len(infos) != 1:
+        return None
+    
+    xref, smask, width, height, _, colorspace, _, _, image_filter, _ = images[0]
+    info = infos[0]
+    a, b, c, d, _, _ = info["transform"]
+    bbox = fitz.Rect(info["bbox"])
+    if (image_filter != "DCTDecode" or smask or info["colorspace"] == 4
+            or b or c or a <= 0 or d <= 0
+            or bbox.get_area() < SCAN_COVERAGE * page.rect.get_area()):
+        return None
+    if page.get_drawings() or any(span["type"] != 3 for span in page.get_texttrace()):
+        return None
+    
+    # Points PDF → pixels de l'image d'origine (pour les hotspots)
+    matrix = fitz.Matrix(1, 0, 0, 1, -bbox.x0, -bbox.y0) * fitz.Matrix(width / bbox.width, height / bbox.height)
+    return {"xref": xref, "width": width, "height": height, "matrix": matrix}
+
+def _write_scan_page(doc, scan, images_dir, page_number, params, seconds):
+    """Écrit le flux JPEG brut d'un scan pleine page et retourne son entrée"""
+    with timed(seconds, "write"):
+        filename = store_output(
+            images_dir, f"page_{page_number}.jpg", doc.xref_stream_raw(scan["xref"]), params["contentAddressed"]
+        )
+    image = image_entry(page_number, filename, "jpg")
+    image["width"] = scan["width"]
+    image["height"] = scan["height"]
+    image["format"] = "jpeg"
+    return image
+
+def is_grayscale_page(page):
+    """Vrai si un aperçu basse résolution de la page ne contient aucune couleur"""
+    fitz = load_fitz()
+    probe = page.get_pixmap(matrix=fitz.Matrix(PROBE_ZOOM, PROBE_ZOOM))
+    samples = probe.samples
+    red, green, blue = samples[0::probe.n], samples[1::probe.n], samples[2::probe.n]
+    spread = max(
+        max(map(abs, map(operator.sub, red, green)), default=0),
+        max(map(abs, map(operator.sub, green, blue)), default=0)
+    )
+    return spread <= GRAY_TOLERANCE
+
+def _encode_reduced(pix):
+    """Encode la pixmap en PNG à la profondeur de couleur minimale sans perte visible
+    
+    Niveaux de gris presque purement noir et blanc → 1 bit ; autres niveaux
+    de gris → 8 bits ; couleur à 256 teintes au plus → palette exacte ;
+    sinon RGB 24 bits. Retourne (octets PNG, type de couleur).
+    """
+    Image, _ = load_pillow()
+    if Image is None:
+        return pix.tobytes(IMAGE_FORMAT), "gray" if pix.n == 1 else "rgb"
+    
+    size = (pix.width, pix.height)
+    if pix.n == 1:
+        image = Image.frombuffer("L", size, pix.samples_mv, "raw", "L", pix.stride, 1)
+        histogram = image.histogram()
+        intermediate = sum(histogram[BILEVEL_MARGIN:256 - BILEVEL_MARGIN])
+        if intermediate <= BILEVEL_TOLERANCE * pix.width * pix.height:
+            output = image.point(lambda value: 255 if value >= 128 else 0).convert("1", dither=Image.Dither.NONE)
+            color_type = "bilevel"
+        else:
+            output = image
+            color_type = "gray"
+    else:
+        image = Image.frombuffer("RGB", size, pix.samples_mv, "raw", "RGB", pix.stride, 1)
+        colors = image.getcolors(maxcolors=256)
+        if colors is None:
+            return pix.tobytes(IMAGE_FORMAT), "rgb"
+        palette = Image.new("P", (1, 1))
+        palette.putpalette([channel for _, rgb in colors for channel in rgb])
+        output = image.quantize(palette=palette, dither=Image.Dither.NONE)
+        color_type = "palette"
+    
+    buffer = io.BytesIO()
+    output.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue(), color_type
+
+def _write_bitmap_page(page, matrix, images_dir, page_number, params, seconds):
+    """Rend la page en PNG (et ses variantes) et retourne son entrée"""
+    fitz = load_fitz()
+    # Convertir la page en image (haute résolution), directement en niveaux
+    # de gris si la page ne contient pas de couleur
+    with timed(seconds, "render"):
+        if params["reduceColors"] and is_grayscale_page(page):
+            pix = page.get_pixmap(matrix=matrix, colorspace=fitz.csGRAY)
+        else:
+            pix = page.get_pixmap(matrix=matrix)
+    
+    with timed(seconds, "encode"):
+        if params["reduceColors"]:
+            data, color_type = _encode_reduced(pix)
+        else:
+            data, color_type = pix.tobytes(IMAGE_FORMAT), None
+    
+    # Sauvegarder la page complète
+    with timed(seconds, "write"):
+        filename = store_output(
+            images_dir, f"page_{page_number}.{IMAGE_FORMAT}", data, params["contentAddressed"]
+        )
+    image = image_entry(page_number, filename)
+    image["width"] = pix.width
+    image["height"] = pix.height
+    if color_type:
+        image["colorType"] = color_type
+    
+    # Variantes multi-résolutions (WebP/AVIF) à partir du même rendu
+    if params["variants"]["widths"] and params["variants"]["format"]:
+        with timed(seconds, "variants"):
+            image["variants"] = _write_variants(pix, images_dir, f"page_{page_number}", params)
+    
+    return image
+
+def _write_vector_page(page, matrix, images_dir, page_number, params, seconds):
+    """Exporte la page en SVG (texte converti en tracés) et retourne son entrée
+    
+    Seuls les glyphes utilisés sont tracés, ce qui tient lieu de sous-ensemble
+    de polices ; le SVG n'a besoin d'aucune police côté navigateur.
+    """
+    with timed(seconds, "render"):
+        svg = page.get_svg_image(matrix=matrix, text_as_path=True)
+    with timed(seconds, "encode"):
+        if params["vector"] == "minify":
+            svg = _minify_svg(svg)
+        data = svg.encode("utf-8")
+    
+    with timed(seconds, "write"):
+        filename = store_output(images_dir, f"page_{page_number}.svg", data, params["contentAddressed"])
+    image = image_entry(page_number, filename, "svg")
+    # Même repère que le rendu bitmap (hotspots inchangés)
+    bounds = (page.rect * matrix).irect
+    image["width"] = bounds.width
+    image["height"] = bounds.height
+    image["format"] = "svg"
+    return image
+
+def _cropped_page_entry(page, matrix, images_dir, page_number, params):
+    """Entrée d'une page servie uniquement par ses recadrages (aucun fichier de page pleine)
+    
+    Les dimensions restent celles du rendu pleine page, repère des hotspots ;
+    hors adressage par contenu, l'image d'une exécution précédente est retirée.
+    """
+    if not params["contentAddressed"]:
+        stale = [*Path(images_dir).glob(f"page_{page_number}.*"), *Path(images_dir).glob(f"page_{page_number}-*w.*")]
+        for path in stale:
+            path.unlink()
+    bounds = (page.rect * matrix).irect
+    return {"page": page_number, "width": bounds.width, "height": bounds.height}
+
+def iter_rendered_pages(pdf_path, images_dir, page_numbers, params, clips=None):
+    """Rend une série de pages une à une (le document est ouvert localement)
+    
+    Chaque pixmap est libérée dès que ses fichiers sont écrits : la mémoire
+    reste bornée par la page la plus lourde, quel que soit le nombre de pages.
+    
+    Chaque entrée porte ses mesures dans "stats" (secondes par étape, octets
+    écrits) ; l'ouverture du document est comptée sur la première page.
+    """
+    fitz = load_fitz()
+    seconds = {}
+    with timed(seconds, "open"):
+        doc = fitz.open(pdf_path)
+    
+    try:
+        for page_num in page_numbers:
+            started = time.perf_counter()
+            page = doc[page_num]
+            
+            matrix = fitz.Matrix(*params["matrix"])
+            page_clips = (clips or {}).get(page_num + 1, [])
+            scan = None
+            if params["passthrough"] and not page_clips:
+                scan = find_page_scan(doc, page)
+            pixel_matrix = scan["matrix"] if scan is not None else matrix
+            
+            # Montants de la couche texte (et leurs zones dans l'image), lus
+            # avant le rendu : ils situent les recadrages automatiques
+            with timed(seconds, "amounts"):
+                amounts = extract_amounts(page, pixel_matrix)
+            with timed(seconds, "crops"):
+                rects = {
+                    crop["id"]: _resolve_clip(page, crop, amounts)
+                    for crop in page_clips if crop["clip"] is not None
+                }
+                rects = {doc_id: rect for doc_id, rect in rects.items() if rect is not None}
+            
+            if page_clips and len(rects) == len(page_clips):
+                # Chaque document de la page a sa zone : la page pleine n'est pas rendue
+                image = _cropped_page_entry(page, matrix, images_dir, page_num + 1, params)
+            elif scan is not None:
+                # Scan pleine page : octets JPEG d'origine, sans décodage ni ré-encodage
+                image = _write_scan_page(doc, scan, images_dir, page_num + 1, params, seconds)
+            elif params["vector"] and is_vector_page(page):
+                # Page purement vectorielle : SVG net à tout zoom, sans pixmap
+                image = _write_vector_page(page, matrix, images_dir, page_num + 1, params, seconds)
+            else:
+                image = _write_bitmap_page(page, matrix, images_dir, page_num + 1, params, seconds)
+            image["amounts"] = amounts
+            
+            # Recadrages par document : seule la zone demandée est rendue
+            crops = {}
+            for doc_id, rect in rects.items():
+                with timed(seconds, "crops"):
+                    crops[doc_id] = _render_crop(
+                        page, matrix, rect, doc_id, images_dir, params,
+                        gray=image.get("colorType") in ("gray", "bilevel")
+                    )
+            if crops:
+                image["crops"] = crops
+            
+            page = None
+            seconds["total"] = seconds.get("open", 0.0) + time.perf_counter() - started
+            image["stats"] = {"seconds": seconds, "bytes": written_bytes(images_dir, image)}
+            seconds = {}
+            yield image
+    finally:
+        doc.close()
+
+def render_pages(pdf_path, images_dir, page_numbers, params, clips=None):
+    """Rend une tranche de pages dans un worker (chaque worker ouvre son propre document)"""
+    return list(iter_rendered_pages(pdf_path, images_dir, page_numbers, params, clips))
+
+def split_pages(page_numbers, workers):
+    """Découpe la liste de pages en tranches contiguës pour le pool de processus"""
+    # Plusieurs tranches par worker pour équilibrer les pages lourdes (scans)
+    page_numbers = list(page_numbers)
+    chunk_count = min(len(page_numbers), workers * 4)
+    chunk_size = -(-len(page_numbers) // chunk_count)  # division arrondie au supérieur
+    return [
+        page_numbers[start:start + chunk_size]
+        for start in range(0, len(page_numbers), chunk_size)
+    ]
@@ -0,0 +1,70 @@
+"""Rapport d'instrumentation de la construction (JSON ou NDJSON)"""
+import json
+from pathlib import Path
+
+REPORT_VERSION = 1
+
+def page_event(pdf_path, record):
+    """Événement de rapport d'une page : statut, secondes par étape, octets écrits"""
+    event = {"event": "page", "pdf": Path(pdf_path).name, "page": record["page"], "status": record["status"]}
+    if record["stats"]:
+        event["seconds"] = {stage: round(value, 6) for stage, value in record["stats"]["seconds"].items()}
+        event["bytes"] = record["stats"]["bytes"]
+    return event
+
+def json_events(pdf_path, output_dir, seconds):
+    """Événements de rapport des fichiers JSON écrits (durée et taille)"""
+    data_dir = Path(output_dir) / "data"
+    return [
+        {
+            "event": "json",
+            "pdf": Path(pdf_path).name,
+            "file": filename,
+            "seconds": round(elapsed, 6),
+            "bytes": (data_dir / filename).stat().st_size
+        }
+        for filename, elapsed in seconds.items()
+    ]
+
+def write_build_report(report_path, events):
+    """Écrit le rapport d'instrumentation d'une construction
+    
+    Un fichier .ndjson reçoit un événement par ligne ; tout autre nom, un
+    document JSON {"version", "events", "summary"}. Le résumé cumule les
+    secondes par étape ("total" de chaque page, qui les contient déjà, est
+    reporté à part dans "totalSeconds") et classe les pages les plus lentes.
+    """
+    pages = [event for event in events if event["event"] == "page" and "seconds" in event]
+    stages = {}
+    total = 0.0
+    for event in pages:
+        for stage, elapsed in event["seconds"].items():
+            if stage == "total":
+                total += elapsed
+            else:
+                stages[stage] = stages.get(stage, 0.0) + elapsed
+    for event in events:
+        if event["event"] == "json":
+            stages["json"] = stages.get("json", 0.0) + event["seconds"]
+            total += event["seconds"]
+    slowest = sorted(pages, key=lambda event: event["seconds"]["total"], reverse=True)[:10]
+    summary = {
+        "event": "summary",
+        "pages": sum(event["event"] == "page" for event in events),
+        "rendered": len(pages),
+        "seconds": {stage: round(elapsed, 6) for stage, elapsed in stages.items()},
+        "totalSeconds": round(total, 6),
+        "bytes": sum(event.get("bytes", 0) for event in events),
+        "slowest": [
+            {key: event[key] for key in ("pdf", "page", "bytes")} | {"seconds": event["seconds"]["total"]}
+            for event in slowest
+        ]
+    }
+    
+    with open(report_path, "w", encoding="utf-8") as f:
+        if str(report_path).endswith(".ndjson"):
+            for event in events + [summary]:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        else:
+            json.dump({"version": REPORT_VERSION, "events": events, "summary": summary}, f,
+                      ensure_ascii=False, indent=2)
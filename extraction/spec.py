@@ -0,0 +1,101 @@
+"""Spécification déclarative de l'exercice (exercice.toml) : lecture et validation"""
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from .common import PROJECT_DIR
+
+# Spécification déclarative des données de l'exercice (documents, budget, quiz)
+DEFAULT_SPEC_PATH = PROJECT_DIR / "exercice.toml"
+DOCUMENT_KEYS = {"id", "titre", "type", "pagePDF", "imagePath", "montants", "libelles"}
+RUBRIQUE_KEYS = {"type", "libelle", "montantAttendu", "sourceDocId"}
+BUDGET_SECTIONS = ("entrees", "sorties_fixes", "sorties_variables")
+QUIZ_SECTIONS = ("partie1_documents", "partie3_final")
+# Rubriques de dépenses, remplies à partir des montants des documents, et
+# nombre maximal de montants déposés dans une rubrique (tableau du jeu)
+EXPENSE_SECTIONS = ("sorties_fixes", "sorties_variables")
+MAX_AMOUNTS_PER_RUBRIQUE = 3
+
+def spec_for_pdf(pdf_path):
+    """Spécification propre au PDF (<nom>.toml à côté de lui), sinon celle par défaut"""
+    spec_path = Path(pdf_path).with_suffix(".toml")
+    return spec_path if spec_path.is_file() else DEFAULT_SPEC_PATH
+
+def _require(condition, spec_path, message):
+    """Lève une ValueError explicite si la spécification est invalide"""
+    if not condition:
+        raise ValueError(f"{spec_path}: {message}")
+
+def _validate_spec(spec, spec_path):
+    """Vérifie la structure de la spécification d'exercice"""
+    documents = spec.get("documents")
+    _require(isinstance(documents, list) and documents, spec_path, "au moins un [[documents]] est requis")
+    doc_ids = set()
+    for document in documents:
+        missing = DOCUMENT_KEYS - document.keys()
+        _require(not missing, spec_path, f"document {document.get('id', '?')} : champs manquants {sorted(missing)}")
+        _require(document["id"] not in doc_ids, spec_path, f"identifiant de document en double : {document['id']}")
+        _require(all(isinstance(montant, (int, float)) for montant in document["montants"]),
+                 spec_path, f"document {document['id']} : montants non numériques")
+        clip = document.get("clip", "auto")
+        _require(clip == "auto" or (isinstance(clip, list) and len(clip) == 4
+                                     and all(isinstance(coord, (int, float)) for coord in clip)),
+                 spec_path, f"document {document['id']} : clip doit valoir \"auto\" ou [x0, y0, x1, y1]")
+        doc_ids.add(document["id"])
+    
+    budget = spec.get("budget", {})
+    for section in BUDGET_SECTIONS:
+        _require(isinstance(budget.get(section), list), spec_path, f"section budget.{section} manquante")
+        for rubrique in budget[section]:
+            missing = RUBRIQUE_KEYS - rubrique.keys()
+            _require(not missing, spec_path, f"budget.{section} : champs manquants {sorted(missing)}")
+            _require(rubrique["sourceDocId"] in doc_ids, spec_path,
+                     f"budget.{section} : document inconnu {rubrique['sourceDocId']}")
+    _require(isinstance(budget.get("totaux", {}), dict), spec_path, "budget.totaux doit être une table")
+    
+    quiz = spec.get("quiz", {})
+    for section in QUIZ_SECTIONS:
+        _require(isinstance(quiz.get(section), list), spec_path, f"section quiz.{section} manquante")
+        for question in quiz[section]:
+            _require(0 <= question.get("correctIndex", -1) < len(question.get("options", [])),
+                     spec_path, f"question {question.get('id', '?')} : correctIndex hors des options")
+            _require("docId" not in question or question["docId"] in doc_ids,
+                     spec_path, f"question {question['id']} : document inconnu {question.get('docId')}")
+
+def document_clips(documents):
+    """Recadrages demandés par la spécification, regroupés par page PDF
+    
+    Sur une page recadrée, un document sans zone propre figure avec
+    "clip": None : il affiche la page pleine, qui doit donc être rendue.
+    """
+    clipped_pages = {document["pagePDF"] for document in documents if "clip" in document}
+    clips = {}
+    for document in documents:
+        if document["pagePDF"] in clipped_pages:
+            clips.setdefault(document["pagePDF"], []).append({
+                "id": document["id"],
+                "clip": document.get("clip"),
+                "montants": document["montants"]
+            })
+    return clips
+
+@lru_cache(maxsize=None)
+def _compiled_spec(spec_path):
+    """Lit et valide une spécification TOML (une seule fois par processus)"""
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        import tomli as tomllib
+    with open(spec_path, "rb") as f:
+        spec = tomllib.load(f)
+    _validate_spec(spec, spec_path)
+    # Sérialisation compacte, décodée à la demande pour des copies indépendantes
+    return json.dumps(spec, ensure_ascii=False, separators=(",", ":"))
+
+def load_spec(spec_path=DEFAULT_SPEC_PATH):
+    """Retourne la spécification d'exercice (documents, budget, quiz) validée"""
+    return json.loads(_compiled_spec(str(Path(spec_path).resolve())))
+
+def clear_spec_cache():
+    """Oublie les spécifications déjà lues (--watch relit celle qui a changé)"""
+    _compiled_spec.cache_clear()
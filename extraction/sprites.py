@@ -0,0 +1,90 @@
+"""Planche de miniatures des documents (thumbnails.png)"""
+import math
+from pathlib import Path
+
+from .common import IMAGE_FORMAT, load_fitz, write_json
+
+# Planche de miniatures : largeur d'une vignette (pixels, rendue directement
+# depuis le PDF), espacement entre vignettes, fichiers produits
+THUMBNAIL_WIDTH = 160
+SPRITE_PADDING = 2
+SPRITE_IMAGE = "thumbnails.png"
+SPRITE_MAP_FILENAME = "thumbnails.json"
+
+def write_sprite_atlas(pdf_path, output_dir, documents, images=None, width=THUMBNAIL_WIDTH):
+    """Rend une vignette par document et les regroupe dans une planche unique
+    
+    Chaque vignette est rendue directement depuis le PDF avec une matrice de
+    zoom réduite (width pixels de large), sur la zone recadrée du document
+    quand images en porte une, ce qui évite de réduire les rendus 2x. Les
+    vignettes sont rangées en grille dans images/thumbnails.png et
+    data/thumbnails.json associe à chaque docId son rectangle dans la
+    planche (x, y, width, height) ; deux documents montrant la même zone
+    partagent leur vignette. Retourne cette table.
+    """
+    fitz = load_fitz()
+    crops = {doc_id: crop for image in images or [] for doc_id, crop in image.get("crops", {}).items()}
+    thumbnails = {}
+    doc_keys = {}
+    
+    with fitz.open(pdf_path) as doc:
+        for document in documents:
+            page_number = document["pagePDF"]
+            if not 1 <= page_number <= len(doc):
+                print(f"⚠ Document {document['id']} : page {page_number} absente du PDF, pas de vignette")
+                continue
+            page = doc[page_number - 1]
+            crop = crops.get(document["id"])
+            rect = fitz.Rect(crop["clip"]) if crop else page.rect
+            key = (page_number, tuple(rect))
+            doc_keys[document["id"]] = key
+            if key not in thumbnails:
+                zoom = width / rect.width
+                thumbnails[key] = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=rect, alpha=False)
+    
+    # Grille d'environ √n colonnes, chaque rangée aussi haute que sa plus grande vignette
+    columns = math.isqrt(max(len(thumbnails) - 1, 0)) + 1
+    positions = {}
+    x = y = row_height = atlas_width = 0
+    for index, (key, pix) in enumerate(thumbnails.items()):
+        if index and index % columns == 0:
+            x, y, row_height = 0, y + row_height + SPRITE_PADDING, 0
+        positions[key] = (x, y)
+        atlas_width = max(atlas_width, x + pix.width)
+        row_height = max(row_height, pix.height)
+        x += pix.width + SPRITE_PADDING
+    atlas_height = y + row_height
+    
+    sprite_map = {
+        "image": f"assets/images/{SPRITE_IMAGE}",
+        "width": atlas_width,
+        "height": atlas_height,
+        "sprites": {}
+    }
+    if thumbnails:
+        atlas = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, atlas_width, atlas_height), False)
+        atlas.clear_with(255)
+        for key, pix in thumbnails.items():
+            pix.set_origin(*positions[key])
+            atlas.copy(pix, pix.irect)
+        images_dir = Path(output_dir) / "images"
+        images_dir.mkdir(parents=True, exist_ok=True)
+        data = atlas.tobytes(IMAGE_FORMAT)
+        (images_dir / SPRITE_IMAGE).write_bytes(data)
+        sprite_map["bytes"] = len(data)
+        sprite_map["sprites"] = {
+            doc_id: {
+                "x": positions[key][0],
+                "y": positions[key][1],
+                "width": thumbnails[key].width,
+                "height": thumbnails[key].height
+            }
+            for doc_id, key in doc_keys.items()
+        }
+    
+    data_dir = Path(output_dir) / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    write_json(data_dir / SPRITE_MAP_FILENAME, sprite_map)
+    print(f"✓ {SPRITE_MAP_FILENAME} créé ({len(sprite_map['sprites'])} vignettes, "
+          f"planche {atlas_width}×{atlas_height})")
+    return sprite_map
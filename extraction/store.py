@@ -0,0 +1,93 @@
+"""Fichiers produits par page et magasin adressé par contenu"""
+import hashlib
+import json
+from pathlib import Path
+
+from .common import CONTENT_HASH_LENGTH, CONTENT_HASH_PATTERN, IMAGE_FORMAT, file_sha256
+
+ASSET_MANIFEST_FILENAME = "assets-manifest.json"
+
+def store_output(images_dir, name, data, content_addressed):
+    """Écrit un fichier de sortie et retourne son nom effectif
+    
+    En mode adressé par contenu, le fichier est nommé d'après son empreinte
+    et n'est écrit que s'il n'existe pas déjà dans le dossier.
+    """
+    if content_addressed:
+        digest = hashlib.sha256(data).hexdigest()[:CONTENT_HASH_LENGTH]
+        filename = f"{digest}{Path(name).suffix}"
+    else:
+        filename = name
+    
+    path = Path(images_dir) / filename
+    if not (content_addressed and path.exists()):
+        path.write_bytes(data)
+    return filename
+
+def iter_outputs(image):
+    """(nom logique, chemin) de chaque fichier produit pour une page
+    
+    Couvre la page pleine (si elle est rendue), les recadrages par document
+    et leurs variantes.
+    """
+    for entry in [image, *image.get("crops", {}).values()]:
+        # Une page servie par ses seuls recadrages n'a pas de fichier propre
+        if "path" in entry:
+            yield entry.get("name", entry["filename"]), entry["path"]
+        for variant in entry.get("variants", {}).values():
+            filename = variant["path"].rsplit("/", 1)[-1]
+            yield variant.get("name", filename), variant["path"]
+
+def output_filenames(image):
+    """Fichiers produits pour une entrée (page pleine, recadrages et variantes)"""
+    return [path.rsplit("/", 1)[-1] for _, path in iter_outputs(image)]
+
+def output_label(image):
+    """Fichier(s) à afficher pour une page extraite : la page pleine ou ses recadrages"""
+    return image.get("filename") or ", ".join(crop["filename"] for crop in image.get("crops", {}).values())
+
+def image_entry(page_number, filename=None, fmt=IMAGE_FORMAT):
+    """Entrée de la liste extracted_images pour une page"""
+    page_filename = f"page_{page_number}.{fmt}"
+    entry = {
+        "page": page_number,
+        "filename": filename or page_filename,
+        "path": f"assets/images/{filename or page_filename}"
+    }
+    if filename and filename != page_filename:
+        entry["name"] = page_filename
+    return entry
+
+def write_asset_manifest(output_dir, images):
+    """Écrit la table nom logique → fichier adressé par contenu (data/assets-manifest.json)"""
+    assets = {}
+    for image in images:
+        for name, path in iter_outputs(image):
+            assets[f"assets/images/{name}"] = path
+    
+    data_dir = Path(output_dir) / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    with open(data_dir / ASSET_MANIFEST_FILENAME, "w", encoding="utf-8") as f:
+        json.dump(assets, f, ensure_ascii=False, indent=2)
+    return assets
+
+def collect_unreferenced(images_dir, images):
+    """Supprime du magasin les fichiers adressés par contenu qui ne sont plus référencés"""
+    referenced = {filename for image in images for filename in output_filenames(image)}
+    for path in Path(images_dir).iterdir():
+        if CONTENT_HASH_PATTERN.fullmatch(path.stem) and path.name not in referenced:
+            path.unlink()
+
+def written_bytes(images_dir, image):
+    """Taille totale des fichiers produits pour une page"""
+    return sum((Path(images_dir) / filename).stat().st_size for filename in output_filenames(image))
+
+def asset_index(output_dir):
+    """Index des fichiers produits dans images/ : chemin servi → taille et SHA-256"""
+    images_dir = Path(output_dir) / "images"
+    if not images_dir.is_dir():
+        return {}
+    return {
+        f"assets/images/{path.name}": {"bytes": path.stat().st_size, "sha256": file_sha256(path)}
+        for path in sorted(images_dir.iterdir()) if path.is_file()
+    }
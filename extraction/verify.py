@@ -0,0 +1,73 @@
+"""Vérification des références des JSON et empreintes des images"""
+from pathlib import Path
+
+from .common import CONTENT_HASH_LENGTH, read_json, write_json
+from .spec import BUDGET_SECTIONS, QUIZ_SECTIONS
+from .store import asset_index
+from .sprites import SPRITE_MAP_FILENAME
+
+def _asset_references(documents, budget, quiz, sprite_map):
+    """Références des fichiers JSON : (emplacement, "asset" ou "document", valeur, entrée JSON)
+    
+    L'entrée JSON est l'objet qui recevra l'empreinte de l'actif référencé
+    (None pour une référence de document).
+    """
+    for document in documents:
+        yield f"documents.json/{document['id']}", "asset", document["imagePath"], document
+        for width, variant in document.get("variants", {}).items():
+            yield f"documents.json/{document['id']}/variants/{width}", "asset", variant["path"], variant
+    for section in BUDGET_SECTIONS:
+        for rubrique in budget[section]:
+            yield f"budget.json/{section}/{rubrique['libelle']}", "document", rubrique["sourceDocId"], None
+    for doc_id in budget.get("index", {}).get("documents", {}):
+        yield "budget.json/index/documents", "document", doc_id, None
+    for section in QUIZ_SECTIONS:
+        for question in quiz[section]:
+            if "docId" in question:
+                yield f"quiz.json/{question['id']}", "document", question["docId"], None
+    if sprite_map is not None:
+        if sprite_map["sprites"]:
+            yield SPRITE_MAP_FILENAME, "asset", sprite_map["image"], sprite_map
+        for doc_id in sprite_map["sprites"]:
+            yield f"{SPRITE_MAP_FILENAME}/sprites", "document", doc_id, None
+
+def verify_assets(output_dir, **json_options):
+    """Vérifie toutes les références des fichiers JSON et y inscrit les empreintes
+    
+    Indexe les images produites (asset_index) et les identifiants de
+    documents, puis parcourt une seule fois les références de
+    documents.json, budget.json, quiz.json et thumbnails.json : chemins
+    d'images et de variantes, sourceDocId, docId. Une référence cassée lève
+    une ValueError. Sinon, chaque entrée d'image reçoit l'empreinte de son
+    contenu ("hash", préfixe du SHA-256 ; "imageHash" pour imagePath), ce
+    qui permet au client de la mettre en cache sans revalidation. Retourne
+    l'index des actifs.
+    """
+    data_dir = Path(output_dir) / "data"
+    documents = read_json(data_dir / "documents.json")
+    budget = read_json(data_dir / "budget.json")
+    quiz = read_json(data_dir / "quiz.json")
+    if documents is None or budget is None or quiz is None:
+        raise ValueError(f"{data_dir} : documents.json, budget.json et quiz.json sont requis")
+    sprite_map = read_json(data_dir / SPRITE_MAP_FILENAME)
+    
+    assets = asset_index(output_dir)
+    doc_ids = {document["id"] for document in documents}
+    problems = []
+    for where, kind, value, entry in _asset_references(documents, budget, quiz, sprite_map):
+        if kind == "document":
+            if value not in doc_ids:
+                problems.append(f"{where} : document inconnu {value}")
+        elif value not in assets:
+            problems.append(f"{where} : fichier absent {value}")
+        else:
+            digest = assets[value]["sha256"][:CONTENT_HASH_LENGTH]
+            entry["imageHash" if "imagePath" in entry else "hash"] = digest
+    if problems:
+        raise ValueError("Références cassées :\n  " + "\n  ".join(problems))
+    
+    write_json(data_dir / "documents.json", documents, **json_options)
+    if sprite_map is not None:
+        write_json(data_dir / SPRITE_MAP_FILENAME, sprite_map, **json_options)
+    print(f"✓ Références vérifiées ({len(assets)} fichiers, {len(doc_ids)} documents), empreintes inscrites")
+    return assets
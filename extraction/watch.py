@@ -0,0 +1,107 @@
+"""Mode --watch : reconstruction des sorties touchées par une modification"""
+import sys
+import time
+from pathlib import Path
+
+from .common import PROJECT_DIR, link_or_copy
+from .spec import clear_spec_cache, load_spec, spec_for_pdf
+from .build import BUILD_STAGES, build_stages
+
+# Mode --watch : période de scrutation des sources, délai de calme avant
+# reconstruction (secondes), et nœuds à reconstruire selon la source modifiée
+WATCH_INTERVAL = 0.2
+WATCH_DEBOUNCE = 0.3
+WATCH_GRAPH = {
+    "pdf": ("images", "documents"),
+    "spec": ("images", "documents", "budget", "quiz"),
+    "receipt": ("receipt",),
+}
+WATCH_STAGES = ("images", "documents", "budget", "quiz", "receipt")
+RECEIPT_SCRIPT = PROJECT_DIR / "create_receipt.py"
+RECEIPT_IMAGE = "page_3_loyer.png"
+
+def _source_state(path):
+    """Date de modification et taille d'une source (None si absente)"""
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def _rebuild(stages, pdf_path, spec_path, output_dir, workers, options, json_options, mirrors, bundle, thumbnails,
+             verify, images):
+    """Reconstruit les nœuds demandés du graphe de --watch et retourne les pages à jour"""
+    output_dir = Path(output_dir)
+    # La spécification peut avoir changé depuis la dernière lecture
+    clear_spec_cache()
+    spec = load_spec(spec_path)
+    
+    receipt_outputs = []
+    if "receipt" in stages:
+        import subprocess
+        receipt_path = output_dir / "images" / RECEIPT_IMAGE
+        subprocess.run([sys.executable, str(RECEIPT_SCRIPT), "-o", str(receipt_path)], check=True)
+        receipt_outputs = [receipt_path, receipt_path.with_suffix(".svg")]
+    
+    result = build_stages(
+        [stage for stage in BUILD_STAGES if stage in stages], pdf_path, output_dir, spec, images=images,
+        json_options=json_options, thumbnails=thumbnails, verify=verify, bundle=bundle, mirrors=mirrors,
+        verbose=True, workers=workers, **options
+    )
+    for mirror_dir in mirrors:
+        for path in receipt_outputs:
+            link_or_copy(path, Path(mirror_dir) / "images" / path.name)
+    return result["images"]
+
+def watch(pdf_path, output_dir, spec_path=None, workers=1, json_options=None, mirrors=(), bundle=False,
+          thumbnails=False, verify=False, **options):
+    """Reconstruit en continu les sorties touchées par une modification des sources
+    
+    Les sources (PDF, spécification TOML, create_receipt.py) sont scrutées
+    toutes les WATCH_INTERVAL secondes ; après WATCH_DEBOUNCE secondes sans
+    nouvelle modification, seuls les nœuds qui en dépendent (WATCH_GRAPH) sont
+    reconstruits (ainsi que le paquet, la planche de miniatures et la
+    vérification des références, avec bundle, thumbnails et verify) puis
+    reflétés dans les dossiers mirrors. Dans le PDF, seules les pages
+    modifiées sont rendues à nouveau (manifeste de cache). Une erreur de
+    reconstruction est affichée sans arrêter la surveillance.
+    """
+    json_options = json_options or {}
+    sources = {
+        "pdf": Path(pdf_path),
+        "spec": Path(spec_path or spec_for_pdf(pdf_path)),
+        "receipt": RECEIPT_SCRIPT
+    }
+    build = (pdf_path, sources["spec"], output_dir, workers, options, json_options, mirrors, bundle, thumbnails,
+             verify)
+    
+    images = _rebuild(set(WATCH_STAGES) - {"receipt"}, *build, [])
+    print(f"👀 Surveillance de {', '.join(str(path) for path in sources.values())} (Ctrl+C pour arrêter)", flush=True)
+    
+    states = {node: _source_state(path) for node, path in sources.items()}
+    pending = set()
+    last_change = 0.0
+    try:
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            for node, path in sources.items():
+                state = _source_state(path)
+                if state != states[node]:
+                    states[node] = state
+                    pending.add(node)
+                    last_change = time.monotonic()
+            if not pending or time.monotonic() - last_change < WATCH_DEBOUNCE:
+                continue
+            
+            changed, pending = pending, set()
+            stages = {stage for node in changed for stage in WATCH_GRAPH[node]}
+            started = time.perf_counter()
+            try:
+                images = _rebuild(stages, *build, images)
+            except Exception as error:  # sources en cours d'édition : on attend la prochaine version
+                print(f"⚠ Reconstruction impossible ({', '.join(sorted(changed))}) : {error}", flush=True)
+                continue
+            done = [stage for stage in WATCH_STAGES if stage in stages]
+            print(f"↻ {', '.join(done)} reconstruits en {time.perf_counter() - started:.2f} s", flush=True)
+    except KeyboardInterrupt:
+        print("\n✅ Surveillance arrêtée")
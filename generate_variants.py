@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Générateur de variantes de l'exercice (ménages synthétiques cohérents)
+
+À partir de la spécification (exercice.toml), tire en lot avec NumPy des
+milliers de ménages : montants des documents, rubriques du budget qui en
+découlent, totaux équilibrés (solde positif) et réponses recalculées du quiz
+final (f1 à f3). Les variantes sont écrites en JSON par tranches.
+"""
+import argparse
+import itertools
+import time
+from pathlib import Path
+
+import numpy as np
+
+from extraction import (
+    BUDGET_SECTIONS, EXPENSE_SECTIONS, MAX_AMOUNTS_PER_RUBRIQUE, DEFAULT_SPEC_PATH,
+    load_spec, to_cents, write_json
+)
+
+VARIANTS_VERSION = 1
+DEFAULT_COUNT = 1000
+DEFAULT_SHARD_SIZE = 500
+INDEX_FILENAME = "variants-index.json"
+
+# Variation relative des montants, par section de la rubrique qui les utilise
+VARIATION = {"entrees": 0.10, "sorties_fixes": 0.10, "sorties_variables": 0.35}
+# Part des ressources épargnée (solde / entrées), tirée uniformément
+SAVINGS_RATIO = (0.05, 0.40)
+# Réponses de la question f3 : fraction des ressources de chaque option
+SAVINGS_FRACTIONS = (1 / 3, 1 / 5, 1 / 2, 1 / 10)
+# Distracteur de la question f2 : une épargne partielle, recalculée à la
+# moitié du solde pour qu'elle ne coïncide jamais avec la bonne réponse
+PARTIAL_SAVINGS_PREFIX = "Oui, mais seulement"
+SAVINGS_OPTIONS = (
+    "Environ 1/3 des ressources",
+    "Environ 1/5 des ressources",
+    "La moitié des ressources",
+    "Environ 1/10 des ressources",
+)
+
+def _format_euros(cents):
+    """Montant au format de l'exercice : 2102,52€"""
+    return f"{cents // 100},{cents % 100:02d}€"
+
+def rubrique_composition(budget, documents):
+    """Montants de documents dont chaque rubrique est la somme
+
+    Retourne la liste à plat des montants (docId, position) et, par rubrique
+    (dans l'ordre des sections), les indices de ses montants dans cette liste
+    — vide si la rubrique ne provient d'aucun document (salaire, par exemple).
+    Chaque montant ne sert qu'à une rubrique ; les combinaisons les plus
+    courtes sont préférées, comme dans check_budget_consistency.
+    """
+    slots = [
+        (document["id"], position, to_cents(montant))
+        for document in documents for position, montant in enumerate(document["montants"])
+    ]
+    sources = {rubrique["sourceDocId"] for section in EXPENSE_SECTIONS for rubrique in budget[section]}
+    used = set()
+    composition = []
+    for section in BUDGET_SECTIONS:
+        for rubrique in budget[section]:
+            target = to_cents(rubrique["montantAttendu"])
+            candidates = [
+                index for index, (doc_id, _, _) in enumerate(slots)
+                if index not in used and (doc_id == rubrique["sourceDocId"]
+                                          or (section != "entrees" and doc_id not in sources))
+            ]
+            match = next((
+                combination
+                for size in range(1, MAX_AMOUNTS_PER_RUBRIQUE + 1)
+                for combination in itertools.combinations(candidates, size)
+                if sum(slots[index][2] for index in combination) == target
+            ), ())
+            if not match and section != "entrees":
+                raise ValueError(f"Rubrique {rubrique['libelle']} : aucun montant de document correspondant")
+            used.update(match)
+            composition.append(list(match))
+    return [(doc_id, position) for doc_id, position, _ in slots], composition
+
+def generate_amounts(spec, count, seed=0):
+    """Tire count ménages d'un coup (tableaux NumPy, montants en centimes)
+
+    Retourne (montants des documents, montants des rubriques, entrées,
+    sorties, solde), de formes (count, montants) et (count, rubriques) pour
+    les deux premiers, (count,) pour les totaux.
+    """
+    budget, documents = spec["budget"], spec["documents"]
+    slots, composition = rubrique_composition(budget, documents)
+    rubriques = [(section, rubrique) for section in BUDGET_SECTIONS for rubrique in budget[section]]
+    rng = np.random.default_rng(seed)
+
+    # Montants des documents : base de l'exercice × facteur aléatoire par montant
+    montants_by_doc = {document["id"]: document["montants"] for document in documents}
+    base = np.array([to_cents(montants_by_doc[doc_id][position]) for doc_id, position in slots], dtype=np.int64)
+    spread = np.full(len(slots), VARIATION["sorties_variables"])
+    for (section, _), indices in zip(rubriques, composition):
+        spread[indices] = VARIATION[section]
+    factors = rng.uniform(1 - spread, 1 + spread, size=(count, len(slots)))
+    doc_cents = np.maximum(np.rint(base * factors).astype(np.int64), 1)
+
+    # Rubriques : somme de leurs montants (matrice d'appartenance)
+    membership = np.zeros((len(slots), len(rubriques)), dtype=np.int64)
+    for column, indices in enumerate(composition):
+        membership[indices, column] = 1
+    rubrique_cents = doc_cents @ membership
+
+    # Sorties, puis entrées ajustées par la rubrique libre pour un solde positif
+    sections = np.array([section for section, _ in rubriques])
+    expenses = rubrique_cents[:, np.isin(sections, EXPENSE_SECTIONS)].sum(axis=1)
+    free = [column for column, indices in enumerate(composition) if not indices and sections[column] == "entrees"]
+    if free:
+        ratio = rng.uniform(*SAVINGS_RATIO, size=count)
+        income = np.ceil(expenses / (1 - ratio)).astype(np.int64)
+        tied = rubrique_cents[:, sections == "entrees"].sum(axis=1)
+        rubrique_cents[:, free[0]] = np.maximum(income - tied, 0)
+    incomes = rubrique_cents[:, sections == "entrees"].sum(axis=1)
+
+    return doc_cents, rubrique_cents, incomes, expenses, incomes - expenses
+
+def _final_quiz(template, incomes, expenses, balance):
+    """Questions de la partie 3 avec les réponses du ménage (f1 à f3 recalculées)"""
+    questions = []
+    for question in template:
+        question = dict(question)
+        if question["id"] == "f1":
+            question["explication"] = (
+                f"Oui, leur budget est positif car leurs entrées ({_format_euros(incomes)}) "
+                f"sont supérieures à leurs sorties ({_format_euros(expenses)})"
+            )
+        elif question["id"] == "f2":
+            options = [
+                f"{PARTIAL_SAVINGS_PREFIX} {balance // 200}€" if option.startswith(PARTIAL_SAVINGS_PREFIX) else option
+                for option in question["options"]
+            ]
+            options[question["correctIndex"]] = f"Oui, ils peuvent économiser {_format_euros(balance)}"
+            question["options"] = options
+            question["explication"] = (
+                f"Oui, ils peuvent économiser {_format_euros(balance)} (différence entre entrées et sorties)"
+            )
+        elif question["id"] == "f3":
+            ratio = balance / incomes
+            correct = min(range(len(SAVINGS_FRACTIONS)), key=lambda index: abs(SAVINGS_FRACTIONS[index] - ratio))
+            percent = round(ratio * 100)
+            options = list(SAVINGS_OPTIONS)
+            options[correct] = f"{options[correct]} ({percent}%)"
+            question["options"] = options
+            question["correctIndex"] = correct
+            question["explication"] = (
+                f"L'épargne représente {SAVINGS_OPTIONS[correct][0].lower()}{SAVINGS_OPTIONS[correct][1:]}, "
+                f"soit {percent}% ({_format_euros(balance)} / {_format_euros(incomes)})"
+            )
+        questions.append(question)
+    return questions
+
+def generate_variants(spec, count, seed=0, prefix="menage"):
+    """Produit count variantes complètes (documents, budget, quiz final)"""
+    doc_cents, rubrique_cents, incomes, expenses, balance = generate_amounts(spec, count, seed)
+    slots, _ = rubrique_composition(spec["budget"], spec["documents"])
+    doc_ids = [document["id"] for document in spec["documents"]]
+
+    # Conversion en euros une fois pour toutes (tolist() évite les types NumPy dans le JSON)
+    doc_euros = (doc_cents / 100).tolist()
+    rubrique_euros = (rubrique_cents / 100).tolist()
+    totals = np.stack([incomes, expenses, balance], axis=1)
+
+    variants = []
+    for row in range(count):
+        montants = {doc_id: [] for doc_id in doc_ids}
+        for (doc_id, _), value in zip(slots, doc_euros[row]):
+            montants[doc_id].append(value)
+
+        budget = {}
+        column = 0
+        for section in BUDGET_SECTIONS:
+            budget[section] = []
+            for rubrique in spec["budget"][section]:
+                budget[section].append(dict(rubrique, montantAttendu=rubrique_euros[row][column]))
+                column += 1
+        row_incomes, row_expenses, row_balance = (int(value) for value in totals[row])
+        budget["totaux"] = {
+            "total_entrees": row_incomes / 100,
+            "total_sorties": row_expenses / 100,
+            "solde": row_balance / 100
+        }
+
+        variants.append({
+            "id": f"{prefix}-{row + 1:05d}",
+            "documents": [{"id": doc_id, "montants": montants[doc_id]} for doc_id in doc_ids],
+            "budget": budget,
+            "quiz": {
+                "partie3_final": _final_quiz(spec["quiz"]["partie3_final"], row_incomes, row_expenses, row_balance)
+            }
+        })
+    return variants
+
+def write_shards(variants, output_dir, shard_size=DEFAULT_SHARD_SIZE, seed=0, **json_options):
+    """Écrit les variantes par tranches (variants-0000.json, ...) et leur index"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    shards = []
+    for number, start in enumerate(range(0, len(variants), shard_size)):
+        chunk = variants[start:start + shard_size]
+        filename = f"variants-{number:04d}.json"
+        write_json(output_dir / filename, {
+            "version": VARIANTS_VERSION,
+            "shard": number,
+            "variants": chunk
+        }, **json_options)
+        shards.append({"file": filename, "count": len(chunk), "first": chunk[0]["id"], "last": chunk[-1]["id"]})
+
+    write_json(output_dir / INDEX_FILENAME, {
+        "version": VARIANTS_VERSION,
+        "seed": seed,
+        "count": len(variants),
+        "shards": shards
+    }, **json_options)
+    return shards
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Génération de variantes synthétiques de l'exercice")
+    parser.add_argument(
+        "-n", "--count", type=int, default=DEFAULT_COUNT,
+        help=f"nombre de ménages à générer (par défaut {DEFAULT_COUNT})"
+    )
+    parser.add_argument(
+        "-o", "--output", default="build/variants",
+        help="dossier des tranches JSON (par défaut build/variants)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="graine du tirage (même graine, mêmes variantes)"
+    )
+    parser.add_argument(
+        "--shard-size", type=int, default=DEFAULT_SHARD_SIZE,
+        help=f"nombre de variantes par fichier (par défaut {DEFAULT_SHARD_SIZE})"
+    )
+    parser.add_argument(
+        "--spec", default=DEFAULT_SPEC_PATH,
+        help="spécification TOML servant de modèle (par défaut exercice.toml)"
+    )
+    parser.add_argument(
+        "--minify", action="store_true",
+        help="écrire les fichiers JSON sans indentation"
+    )
+    parser.add_argument(
+        "--compress", action="append", default=[], choices=("gz", "br"),
+        help="ajouter une variante précompressée de chaque JSON (.json.gz, .json.br)"
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    variants = generate_variants(load_spec(args.spec), args.count, args.seed)
+    shards = write_shards(variants, args.output, args.shard_size, args.seed,
+                          minify=args.minify, compress=tuple(args.compress))
+    elapsed = time.perf_counter() - started
+    print(f"✓ {len(variants)} ménages écrits dans {args.output} ({len(shards)} fichiers, {elapsed:.2f} s)")
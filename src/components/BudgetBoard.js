@@ -5,7 +5,7 @@
 import { createElement, formatEuro, announce } from '../utils/dom.js';
 import { ValidationService } from '../services/validation.js';
 import { ScoringService } from '../services/scoring.js';
-import { resolveAssetUrl } from '../utils/assets.js';
+import { resolveAssetUrl, versionedAssetUrl } from '../utils/assets.js';
 import { initTouchDrag } from '../utils/touch-drag.js';
 
 export class BudgetBoard {
@@ -38,7 +38,7 @@ export class BudgetBoard {
       const documentsData = await docsRes.json();
       this.documents = documentsData.map(doc => ({
         ...doc,
-        imagePath: resolveAssetUrl(doc.imagePath || `assets/images/page_${doc.pagePDF}.png`)
+        imagePath: versionedAssetUrl(doc.imagePath || `assets/images/page_${doc.pagePDF}.png`, doc.imageHash)
       }));
 
       this.render();
@@ -729,6 +729,9 @@ export class BudgetBoard {
           // Add misplaced class for wrong amounts (not just missing)
           if (validationResult && validationResult.error === 'wrong_amount') {
             dropZone.classList.add('misplaced');
+            dropZone.title = validationResult.expectedIn && validationResult.expectedIn.length > 0
+              ? 'Ce montant appartient à une autre rubrique'
+              : 'Ce montant ne correspond à aucune rubrique';
           }
         }
       }
@@ -119,12 +119,41 @@ export class ValidationService {
       }
     });
 
+    // Montants incorrects : rubriques qui attendent ce montant (index de budget.json)
+    results.errors.forEach(error => {
+      if (error.error === 'wrong_amount') {
+        error.expectedIn = this.findRubriquesForAmount(placedAmounts[error.rubrique], expectedBudget);
+        results.items[error.rubrique].expectedIn = error.expectedIn;
+      }
+    });
+
     // Calculer les totaux
     results.totals = this.calculateTotals(placedAmounts, expectedBudget);
 
     return results;
   }
 
+  /**
+   * Rubriques candidates pour un montant
+   * Utilise l'index précalculé de budget.json (centimes → rubriques) s'il existe
+   */
+  findRubriquesForAmount(amount, expectedBudget) {
+    const cents = Math.round(amount * 100);
+    if (expectedBudget.index && expectedBudget.index.montants) {
+      return expectedBudget.index.montants[cents] || [];
+    }
+
+    const candidates = [];
+    ['entrees', 'sorties_fixes', 'sorties_variables'].forEach(section => {
+      expectedBudget[section].forEach(item => {
+        if (Math.round(item.montantAttendu * 100) === cents) {
+          candidates.push({ section, libelle: item.libelle });
+        }
+      });
+    });
+    return candidates;
+  }
+
   /**
    * Calcule les totaux du budget
    */
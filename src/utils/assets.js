@@ -65,3 +65,11 @@ export function resolveAssetUrl(path) {
 
   return `${baseUrl}${relativePath}`;
 }
+
+export function versionedAssetUrl(path, contentHash) {
+  const url = resolveAssetUrl(path);
+  if (!contentHash) {
+    return url;
+  }
+  return `${url}${url.includes('?') ? '&' : '?'}v=${contentHash}`;
+}
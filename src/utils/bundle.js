@@ -0,0 +1,116 @@
+/**
+ * Lecture du paquet d'actifs assets.bundle (produit par extract_pdf.py --bundle)
+ *
+ * Format : "BDL1", longueur de l'en-tête (uint32 little-endian), en-tête JSON
+ * { version, entries: { chemin: { offset, length, type, sha256 } } }, puis les
+ * contenus. Les positions sont relatives au début de la zone de données.
+ */
+
+const BUNDLE_MAGIC = 'BDL1';
+const PREAMBLE_LENGTH = 8;
+
+function decodeHeader(bytes, headerLength) {
+  const magic = String.fromCharCode(...bytes.subarray(0, 4));
+  if (magic !== BUNDLE_MAGIC) {
+    throw new Error('bundle: signature BDL1 absente');
+  }
+  return JSON.parse(new TextDecoder().decode(bytes.subarray(PREAMBLE_LENGTH, PREAMBLE_LENGTH + headerLength)));
+}
+
+/**
+ * Analyse un paquet complet (ArrayBuffer) ; les contenus sont des vues, sans copie
+ */
+export function parseBundle(buffer) {
+  const bytes = new Uint8Array(buffer);
+  const headerLength = new DataView(buffer).getUint32(4, true);
+  const header = decodeHeader(bytes, headerLength);
+  const dataStart = PREAMBLE_LENGTH + headerLength;
+
+  return {
+    entries: header.entries,
+    dataStart,
+
+    has(name) {
+      return Object.prototype.hasOwnProperty.call(header.entries, name);
+    },
+
+    bytes(name) {
+      const entry = header.entries[name];
+      if (!entry) {
+        return null;
+      }
+      const start = dataStart + entry.offset;
+      return bytes.subarray(start, start + entry.length);
+    },
+
+    json(name) {
+      const view = this.bytes(name);
+      return view ? JSON.parse(new TextDecoder().decode(view)) : null;
+    },
+
+    blob(name) {
+      const view = this.bytes(name);
+      return view ? new Blob([view], { type: header.entries[name].type }) : null;
+    }
+  };
+}
+
+/**
+ * Octets [start, end) d'une ressource distante par requête Range. Si le
+ * serveur ignore Range (200 au lieu de 206), la réponse complète est renvoyée
+ * dans full pour que l'appelant la garde au lieu de la retélécharger
+ */
+async function fetchRange(url, start, end) {
+  const response = await fetch(url, { headers: { Range: `bytes=${start}-${end - 1}` } });
+  if (!response.ok) {
+    throw new Error(`bundle: ${url} inaccessible (${response.status})`);
+  }
+  const buffer = await response.arrayBuffer();
+  if (response.status === 206) {
+    return { bytes: new Uint8Array(buffer), full: null };
+  }
+  return { bytes: new Uint8Array(buffer, start, end - start), full: buffer };
+}
+
+function indexOfBundle(bundle) {
+  return { entries: bundle.entries, dataStart: bundle.dataStart, bundle };
+}
+
+/**
+ * Lit seulement l'en-tête d'un paquet distant (deux requêtes Range) ; sans
+ * prise en charge de Range, le paquet complet reçu est gardé dans l'index
+ */
+export async function fetchBundleIndex(url) {
+  const preamble = await fetchRange(url, 0, PREAMBLE_LENGTH);
+  if (preamble.full) {
+    return indexOfBundle(parseBundle(preamble.full));
+  }
+  const headerLength = new DataView(preamble.bytes.buffer, preamble.bytes.byteOffset, PREAMBLE_LENGTH).getUint32(4, true);
+
+  const head = await fetchRange(url, 0, PREAMBLE_LENGTH + headerLength);
+  if (head.full) {
+    return indexOfBundle(parseBundle(head.full));
+  }
+  const header = decodeHeader(head.bytes, headerLength);
+  return { entries: header.entries, dataStart: PREAMBLE_LENGTH + headerLength, bundle: null };
+}
+
+/**
+ * Télécharge un seul fichier du paquet distant (requête Range), ou le lit
+ * dans le paquet complet déjà reçu
+ */
+export async function fetchBundleEntry(url, index, name) {
+  const entry = index.entries[name];
+  if (!entry) {
+    throw new Error(`bundle: ${name} absent du paquet`);
+  }
+  if (index.bundle) {
+    return index.bundle.bytes(name);
+  }
+  const start = index.dataStart + entry.offset;
+  const range = await fetchRange(url, start, start + entry.length);
+  if (range.full) {
+    index.bundle = parseBundle(range.full);
+  }
+  return range.bytes;
+}
@@ -0,0 +1,25 @@
+import { resolveAssetUrl } from './assets.js';
+
+/**
+ * Style CSS affichant la miniature d'un document depuis la planche
+ * thumbnails.png (data/thumbnails.json, produit par extract_pdf.py --thumbnails)
+ *
+ * La vignette est mise à l'échelle pour occuper `width` pixels de large ;
+ * retourne null si le document n'a pas de vignette.
+ */
+export function thumbnailStyle(atlas, docId, width) {
+  const sprite = atlas?.sprites?.[docId];
+  if (!sprite) {
+    return null;
+  }
+
+  const scale = width / sprite.width;
+  return {
+    width: `${width}px`,
+    height: `${Math.round(sprite.height * scale)}px`,
+    backgroundImage: `url("${resolveAssetUrl(atlas.image)}")`,
+    backgroundRepeat: 'no-repeat',
+    backgroundPosition: `${-sprite.x * scale}px ${-sprite.y * scale}px`,
+    backgroundSize: `${atlas.width * scale}px ${atlas.height * scale}px`
+  };
+}
@@ -1,5 +1,5 @@
 import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest';
-import { resolveAssetUrl } from '../src/utils/assets.js';
+import { resolveAssetUrl, versionedAssetUrl } from '../src/utils/assets.js';
 
 describe('resolveAssetUrl', () => {
   beforeEach(() => {
@@ -46,4 +46,11 @@ describe('resolveAssetUrl', () => {
     const absoluteUrl = 'https://cdn.example.org/images/doc.png';
     expect(resolveAssetUrl(absoluteUrl)).toBe(absoluteUrl);
   });
+
+  it('ajoute l\'empreinte du contenu quand elle est connue', () => {
+    expect(versionedAssetUrl('assets/images/page_1.png', '0d6946feea4cfbbc'))
+      .toBe('https://example.com/budget-exercice-1c/assets/images/page_1.png?v=0d6946feea4cfbbc');
+    expect(versionedAssetUrl('assets/images/page_1.png'))
+      .toBe('https://example.com/budget-exercice-1c/assets/images/page_1.png');
+  });
 });
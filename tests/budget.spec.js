@@ -13,4 +13,40 @@ describe('ValidationService', () => {
     const result = service.validateBudgetItem(700.00, 746.00);
     expect(result.isValid).toBe(false);
   });
+
+  it('devrait retrouver les rubriques d\'un montant via l\'index', () => {
+    const service = new ValidationService();
+    const budget = {
+      entrees: [],
+      sorties_fixes: [{ libelle: 'Loyer', montantAttendu: 746.00 }],
+      sorties_variables: [],
+      index: { montants: { 74600: [{ section: 'sorties_fixes', libelle: 'Loyer' }] } }
+    };
+    expect(service.findRubriquesForAmount(746.00, budget)).toEqual([{ section: 'sorties_fixes', libelle: 'Loyer' }]);
+    delete budget.index;
+    expect(service.findRubriquesForAmount(746.00, budget)).toEqual([{ section: 'sorties_fixes', libelle: 'Loyer' }]);
+    expect(service.findRubriquesForAmount(700.00, budget)).toEqual([]);
+  });
+
+  it('devrait indiquer la rubrique attendue d\'un montant mal placé', () => {
+    const service = new ValidationService();
+    const budget = {
+      entrees: [],
+      sorties_fixes: [
+        { libelle: 'Loyer', montantAttendu: 746.00 },
+        { libelle: 'Assurance voiture', montantAttendu: 35.28 }
+      ],
+      sorties_variables: [],
+      totaux: { total_entrees: 0, total_sorties: 781.28, solde: -781.28 },
+      index: {
+        montants: {
+          74600: [{ section: 'sorties_fixes', libelle: 'Loyer' }],
+          3528: [{ section: 'sorties_fixes', libelle: 'Assurance voiture' }]
+        }
+      }
+    };
+    const result = service.validateBudget({ Loyer: 35.28, 'Assurance voiture': 12.00 }, budget);
+    expect(result.items.Loyer.expectedIn).toEqual([{ section: 'sorties_fixes', libelle: 'Assurance voiture' }]);
+    expect(result.items['Assurance voiture'].expectedIn).toEqual([]);
+  });
 });
@@ -0,0 +1,90 @@
+import { describe, it, expect, afterEach, vi } from 'vitest';
+import { parseBundle, fetchBundleIndex, fetchBundleEntry } from '../src/utils/bundle.js';
+
+function buildBundle(files) {
+  const encoder = new TextEncoder();
+  const entries = {};
+  const contents = [];
+  let offset = 0;
+  Object.entries(files).forEach(([name, text]) => {
+    const data = encoder.encode(text);
+    entries[name] = { offset, length: data.length, type: 'application/json', sha256: '' };
+    contents.push(data);
+    offset += data.length;
+  });
+
+  const header = encoder.encode(JSON.stringify({ version: 1, entries }));
+  const bytes = new Uint8Array(8 + header.length + offset);
+  bytes.set(encoder.encode('BDL1'), 0);
+  new DataView(bytes.buffer).setUint32(4, header.length, true);
+  bytes.set(header, 8);
+  let position = 8 + header.length;
+  contents.forEach(data => {
+    bytes.set(data, position);
+    position += data.length;
+  });
+  return bytes.buffer;
+}
+
+describe('parseBundle', () => {
+  it('retrouve chaque fichier par son chemin', () => {
+    const bundle = parseBundle(buildBundle({
+      'assets/data/budget.json': '{"totaux":{"solde":352.52}}',
+      'assets/data/quiz.json': '[]'
+    }));
+    expect(bundle.json('assets/data/budget.json').totaux.solde).toBe(352.52);
+    expect(bundle.json('assets/data/quiz.json')).toEqual([]);
+    expect(bundle.has('assets/images/page_1.png')).toBe(false);
+  });
+
+  it('renvoie des vues sur le tampon, sans copie', () => {
+    const buffer = buildBundle({ 'assets/data/quiz.json': '[]' });
+    expect(parseBundle(buffer).bytes('assets/data/quiz.json').buffer).toBe(buffer);
+  });
+
+  it('rejette un fichier qui n\'est pas un paquet', () => {
+    expect(() => parseBundle(new ArrayBuffer(16))).toThrow();
+  });
+});
+
+describe('fetchBundleEntry', () => {
+  const buffer = buildBundle({
+    'assets/data/budget.json': '{"totaux":{"solde":352.52}}',
+    'assets/data/quiz.json': '[1,2,3]'
+  });
+
+  function stubServer(honoursRange) {
+    vi.stubGlobal('fetch', vi.fn(async (url, { headers }) => {
+      const [, start, end] = headers.Range.match(/bytes=(\d+)-(\d+)/).map(Number);
+      const body = honoursRange ? buffer.slice(start, end + 1) : buffer;
+      return { ok: true, status: honoursRange ? 206 : 200, arrayBuffer: async () => body };
+    }));
+  }
+
+  afterEach(() => {
+    vi.unstubAllGlobals();
+  });
+
+  it('ne télécharge que la plage du fichier demandé', async () => {
+    stubServer(true);
+    const index = await fetchBundleIndex('assets/assets.bundle');
+    const bytes = await fetchBundleEntry('assets/assets.bundle', index, 'assets/data/quiz.json');
+    expect(new TextDecoder().decode(bytes)).toBe('[1,2,3]');
+  });
+
+  it('découpe la réponse complète si le serveur ignore Range', async () => {
+    stubServer(false);
+    const index = await fetchBundleIndex('assets/assets.bundle');
+    const bytes = await fetchBundleEntry('assets/assets.bundle', index, 'assets/data/quiz.json');
+    expect(new TextDecoder().decode(bytes)).toBe('[1,2,3]');
+  });
+
+  it('ne télécharge le paquet qu\'une fois si le serveur ignore Range', async () => {
+    stubServer(false);
+    const index = await fetchBundleIndex('assets/assets.bundle');
+    await fetchBundleEntry('assets/assets.bundle', index, 'assets/data/quiz.json');
+    const bytes = await fetchBundleEntry('assets/assets.bundle', index, 'assets/data/budget.json');
+    expect(JSON.parse(new TextDecoder().decode(bytes)).totaux.solde).toBe(352.52);
+    expect(fetch).toHaveBeenCalledTimes(1);
+  });
+});
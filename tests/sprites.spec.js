@@ -0,0 +1,34 @@
+import { describe, it, expect } from 'vitest';
+import { thumbnailStyle } from '../src/utils/sprites.js';
+
+const atlas = {
+  image: 'assets/images/thumbnails.png',
+  width: 322,
+  height: 229,
+  sprites: {
+    'assurance-voiture': { x: 0, y: 0, width: 160, height: 227 },
+    restaurant: { x: 162, y: 0, width: 160, height: 60 }
+  }
+};
+
+describe('thumbnailStyle', () => {
+  it('positionne la planche sur le rectangle du document', () => {
+    const style = thumbnailStyle(atlas, 'restaurant', 160);
+    expect(style.width).toBe('160px');
+    expect(style.height).toBe('60px');
+    expect(style.backgroundPosition).toBe('-162px 0px');
+    expect(style.backgroundSize).toBe('322px 229px');
+    expect(style.backgroundImage).toContain('assets/images/thumbnails.png');
+  });
+
+  it('met la planche à l\'échelle de la largeur demandée', () => {
+    const style = thumbnailStyle(atlas, 'restaurant', 80);
+    expect(style.height).toBe('30px');
+    expect(style.backgroundPosition).toBe('-81px 0px');
+    expect(style.backgroundSize).toBe('161px 114.5px');
+  });
+
+  it('renvoie null pour un document sans vignette', () => {
+    expect(thumbnailStyle(atlas, 'inconnu', 160)).toBeNull();
+  });
+});
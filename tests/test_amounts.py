@@ -0,0 +1,47 @@
+"""Montants relevés dans la couche texte (AMOUNT_PATTERN, extract_amounts)"""
+import pytest
+
+from extraction.amounts import AMOUNT_PATTERN, parse_amount
+
+
+def amounts(text):
+    return [parse_amount(match) for match in AMOUNT_PATTERN.finditer(text)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("746,00 €", [746.0]),
+    ("2102,52€", [2102.52]),
+    ("Salaire 1750,00", [1750.0]),
+    ("1234,56 EUR", [1234.56]),
+    ("1.234,56", [1234.56]),
+    ("1\u00a0234,56 €", [1234.56]),
+    ("12\u202f345,67", [12345.67]),
+    ("Remise -2,30", [-2.3]),
+    ("Luminus - 61,76 €", [61.76]),
+    ("Frais de gestion - 2,30", [2.3]),
+    ("Qté 2 746,00 €", [746.0]),
+    ("35,28 € et 50,00 €", [35.28, 50.0]),
+])
+def test_amount_pattern(text, expected):
+    assert amounts(text) == expected
+
+
+@pytest.mark.parametrize("text", ["1,5", "12,345", "3.14", "page 2", "1.23,45"])
+def test_amount_pattern_ignores_non_amounts(text):
+    assert amounts(text) == []
+
+
+def test_extract_amounts_from_text_layer():
+    fitz = pytest.importorskip("fitz")
+    from extraction.amounts import extract_amounts
+
+    with fitz.open() as doc:
+        page = doc.new_page()
+        page.insert_text((50, 100), "Total des entrées : 2102,52 EUR")
+        page.insert_text((50, 130), "Qté 2 746,00 EUR")
+        found = extract_amounts(page, fitz.Matrix(2, 2))
+
+    assert [amount["value"] for amount in found] == [2102.52, 746.0]
+    assert found[0]["libelle"] == "Total des entrées"
+    assert found[0]["currency"]
+    assert found[0]["pixelBbox"][2] > found[0]["bbox"][2]
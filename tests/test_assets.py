@@ -0,0 +1,87 @@
+"""Vérification des références (verify_assets) et paquet d'actifs (write_bundle)"""
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from extraction import (
+    BUNDLE_FILENAME, CONTENT_HASH_LENGTH, create_budget_json, create_documents_json, create_quiz_json,
+    load_spec, verify_assets, write_bundle
+)
+
+BUNDLE_JS = Path(__file__).resolve().parent.parent / "src" / "utils" / "bundle.js"
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    """Sortie complète : JSON de la spécification livrée et une image par page citée"""
+    spec = load_spec()
+    create_documents_json(tmp_path, spec=spec)
+    create_budget_json(tmp_path, spec=spec)
+    create_quiz_json(tmp_path, spec=spec)
+    (tmp_path / "images").mkdir()
+    for document in spec["documents"]:
+        image = tmp_path / document["imagePath"].removeprefix("assets/")
+        image.write_bytes(f"png {document['pagePDF']}".encode())
+    return tmp_path
+
+
+def read_data(output_dir, name):
+    with open(output_dir / "data" / name, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_verify_assets_writes_hashes(output_dir):
+    verify_assets(output_dir)
+    for document in read_data(output_dir, "documents.json"):
+        assert len(document["imageHash"]) == CONTENT_HASH_LENGTH
+
+
+def test_verify_assets_rejects_missing_image(output_dir):
+    documents = read_data(output_dir, "documents.json")
+    documents[0]["imagePath"] = "assets/images/page_99.png"
+    (output_dir / "data" / "documents.json").write_text(json.dumps(documents), encoding="utf-8")
+    with pytest.raises(ValueError, match="page_99.png"):
+        verify_assets(output_dir)
+
+
+def test_verify_assets_rejects_unknown_source_document(output_dir):
+    budget = read_data(output_dir, "budget.json")
+    budget["sorties_fixes"][0]["sourceDocId"] = "inconnu"
+    (output_dir / "data" / "budget.json").write_text(json.dumps(budget), encoding="utf-8")
+    with pytest.raises(ValueError, match="document inconnu inconnu"):
+        verify_assets(output_dir)
+
+
+def test_bundle_layout(output_dir):
+    images = [{"page": 1, "filename": "page_1.png", "path": "assets/images/page_1.png"}]
+    entries = write_bundle(output_dir, images)
+    data = (output_dir / BUNDLE_FILENAME).read_bytes()
+
+    # "BDL1", longueur de l'en-tête (uint32 little-endian), en-tête JSON, contenus
+    assert data[:4] == b"BDL1"
+    header_length = int.from_bytes(data[4:8], "little")
+    header = json.loads(data[8:8 + header_length])
+    assert header["entries"] == entries
+    data_start = 8 + header_length
+    for name in ("data/documents.json", "data/budget.json", "data/quiz.json", "images/page_1.png"):
+        entry = entries[f"assets/{name}"]
+        content = data[data_start + entry["offset"]:data_start + entry["offset"] + entry["length"]]
+        assert content == (output_dir / name).read_bytes()
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node absent")
+def test_bundle_reads_with_parse_bundle(output_dir):
+    write_bundle(output_dir, [])
+    script = (
+        f"import {{ readFileSync }} from 'node:fs';"
+        f"import {{ parseBundle }} from {json.dumps(BUNDLE_JS.as_uri())};"
+        f"const file = readFileSync({json.dumps(str(output_dir / BUNDLE_FILENAME))});"
+        f"const bundle = parseBundle(file.buffer.slice(file.byteOffset, file.byteOffset + file.length));"
+        f"console.log(JSON.stringify(bundle.json('assets/data/budget.json')));"
+    )
+    result = subprocess.run(["node", "--input-type=module", "-e", script],
+                            capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout) == read_data(output_dir, "budget.json")
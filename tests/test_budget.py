@@ -0,0 +1,49 @@
+"""Cohérence du budget avec les montants des documents (check_budget_consistency)"""
+import pytest
+
+from extraction import budget_totals, check_budget_consistency, create_budget_json, load_spec
+
+
+def budget(alimentation, totaux=None):
+    budget = {
+        "entrees": [{"libelle": "Salaire", "montantAttendu": 1000.0}],
+        "sorties_fixes": [{"libelle": "Loyer", "montantAttendu": 600.0, "sourceDocId": "quittance"}],
+        "sorties_variables": [{"libelle": "Alimentation", "montantAttendu": alimentation, "sourceDocId": "visa"}],
+    }
+    if totaux is not None:
+        budget["totaux"] = totaux
+    return budget
+
+
+DOCUMENTS = [
+    {"id": "quittance", "montants": [600.0]},
+    {"id": "visa", "montants": [10.5, 20.25, 30.0, 40.0]},
+]
+
+
+def test_shipped_spec_is_consistent():
+    spec = load_spec()
+    assert check_budget_consistency(spec["budget"], spec["documents"]) == []
+
+
+def test_three_amount_sum_is_accepted():
+    assert check_budget_consistency(budget(60.75), DOCUMENTS) == []
+
+
+def test_four_amount_sum_is_rejected():
+    problems = check_budget_consistency(budget(100.75), DOCUMENTS)
+    assert len(problems) == 1
+    assert "Alimentation" in problems[0]
+
+
+def test_wrong_declared_totals_are_rejected():
+    totaux = dict(budget_totals(budget(60.75)), solde=340.0)
+    problems = check_budget_consistency(budget(60.75, totaux), DOCUMENTS)
+    assert problems == ["budget.totaux.solde : 340.0 déclaré, 339.25 calculé"]
+
+
+def test_create_budget_json_refuses_inconsistent_budget(tmp_path):
+    spec = {"budget": budget(100.75), "documents": DOCUMENTS}
+    with pytest.raises(ValueError, match="Alimentation"):
+        create_budget_json(tmp_path, spec=spec)
+    assert not (tmp_path / "data" / "budget.json").exists()
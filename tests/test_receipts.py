@@ -0,0 +1,48 @@
+"""Lecture des lots de quittances (create_receipt.read_receipts)"""
+import pytest
+
+from create_receipt import amount_in_words, format_amount, parse_amount, read_receipts
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("746,00", 746.0),
+    ("746.00", 746.0),
+    ("1 234,56", 1234.56),
+    ("1 234,56 €", 1234.56),
+    ("1 234,56", 1234.56),
+    ("1.234,56", 1234.56),
+])
+def test_parse_amount(text, expected):
+    assert parse_amount(text) == expected
+
+
+def test_parse_amount_reads_format_amount():
+    assert parse_amount(format_amount(12345.6)) == 12345.6
+
+
+def test_read_receipts_csv(tmp_path):
+    path = tmp_path / "eleves.csv"
+    path.write_text("locataire;montant\nJules Thirion;1 234,56\nJulie Thirion;\n", encoding="utf-8")
+    receipts = read_receipts(path)
+    assert receipts == [{"locataire": ["Jules Thirion"], "montant": 1234.56}, {"locataire": ["Julie Thirion"]}]
+
+
+def test_read_receipts_json_text_amount(tmp_path):
+    path = tmp_path / "eleves.json"
+    path.write_text('[{"montant": "746,00"}, {"montant": 650}]', encoding="utf-8")
+    assert read_receipts(path) == [{"montant": 746.0}, {"montant": 650}]
+
+
+@pytest.mark.parametrize("amount, expected", [
+    (71, "(Soixante et onze euros)"),
+    (746, "(Sept cent quarante-six euros)"),
+    (3000, "(Trois mille euros)"),
+    (23456, "(Vingt-trois mille quatre cent cinquante-six euros)"),
+    (80000, "(Quatre-vingt mille euros)"),
+    (200000, "(Deux cent mille euros)"),
+    (1_000_000, "(Un million d'euros)"),
+    (2_000_300, "(Deux millions trois cents euros)"),
+    (1.5, "(Un euro et cinquante centimes)"),
+])
+def test_amount_in_words(amount, expected):
+    assert amount_in_words(amount) == expected